@@ -0,0 +1,84 @@
+"""Memory used by the planned tests.
+
+Compare the TestItem with the layout used up to lymbo 0.3.0 (a __dict__ per test,
+with an output buffer, the error lists and the scopes allocated for each test).
+
+    python benchmarks/memory_test_item.py [NB_TESTS]
+"""
+
+import hashlib
+import io
+import os
+from pathlib import Path
+import pickle
+import sys
+import time
+import tracemalloc
+
+from lymbo.cm import args
+from lymbo.cm import expand
+from lymbo.env import LYMBO_TEST_COLLECTION
+from lymbo.item import TestItem
+
+
+class LegacyTestItem:
+    """The allocations done by the TestItem of lymbo 0.3.0."""
+
+    def __init__(self, path, asynchronous, fnc, parameters, cls, expected):
+        self.path = Path(str(path))
+        self.asynchronous = asynchronous
+        self.fnc = fnc
+        self.parameters = parameters
+        self.cls = cls
+        self.expected = expected
+        md5 = hashlib.md5(f"{path}::{cls}::{fnc}{parameters}".encode()).hexdigest()
+        self.uuid = f"{md5}-{int(time.time() * 1000000)}-{12345:05d}"
+        self.start_at = 0.0
+        self.end_at = 0.0
+        self.output = io.StringIO()
+        self.status = "pending"
+        self.reason = ""
+        self.error_message = []
+        self.traceback = []
+        self.scopes = {
+            "LYMBO_TEST_SCOPE_MODULE": f"{path}",
+            "LYMBO_TEST_SCOPE_GLOBAL": "LYMBO_TEST_SCOPE_GLOBAL",
+            "LYMBO_TEST_SCOPE_MAX": "global",
+            "LYMBO_TEST_SCOPE_CLASS": f"{path}::{cls}",
+            "LYMBO_TEST_SCOPE_FUNCTION": f"{path}::{cls}::{fnc}",
+        }
+
+
+def measure(cls, nb_tests: int) -> tuple[float, float]:
+    """Return the memory (in bytes) used by a test, and the size of a pickled test."""
+
+    path = Path("tests/test_benchmark.py")
+    parameters = list(args(p=expand(*range(nb_tests))))
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tests = [
+        cls(path, False, "test_function", params, "TestClass", None)
+        for params in parameters
+    ]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pickled = sum(len(pickle.dumps(test)) for test in tests[:1000])
+
+    return (after - before) / nb_tests, pickled / min(nb_tests, 1000)
+
+
+if __name__ == "__main__":
+
+    nb_tests = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    os.environ[LYMBO_TEST_COLLECTION] = "1"
+
+    print(f"{nb_tests} tests")
+    for cls in (LegacyTestItem, TestItem):
+        memory, pickled = measure(cls, nb_tests)
+        print(
+            f"{cls.__name__:>16}: {memory:8.0f} bytes per test,"
+            f" {pickled:6.0f} bytes per pickled test"
+        )
@@ -0,0 +1,76 @@
+"""Coordination overhead per test.
+
+Compare the ScopeCoordinator with the scopes shared with Manager proxies used up
+to lymbo 0.3.0 (a dict, a lock and a counter per scope, updated one by one).
+
+    python benchmarks/scope_coordination.py [NB_TESTS]
+"""
+
+import multiprocessing
+import sys
+import time
+
+from lymbo.coordinator import CoordinatorManager
+
+SCOPES = [
+    "LYMBO_TEST_SCOPE_GLOBAL",
+    "tests/test_benchmark.py",
+    "tests/test_benchmark.py::TestClass",
+    "tests/test_benchmark.py::TestClass::test_function",
+]
+
+
+def legacy_scopes(manager, nb_tests: int):
+    """The scopes of lymbo 0.3.0 (see prepare_scopes)."""
+    scopes = manager.dict()
+    for scope_id in SCOPES:
+        scope = manager.dict()
+        scope["count"] = 0
+        scope["lock"] = manager.Lock()
+        scope["resources"] = manager.dict()
+        scope["resources_output"] = manager.dict()
+        scopes[scope_id] = scope
+    for _ in range(nb_tests):
+        for scope_id in SCOPES:
+            scopes[scope_id]["count"] += 1
+    return scopes
+
+
+def legacy_finish_test(scopes):
+    """The end of a test in lymbo 0.3.0 (see unset_scope)."""
+    for scope_id in SCOPES:
+        scope = scopes[scope_id]
+        with scope["lock"]:
+            scope["count"] -= 1
+
+
+def measure(nb_tests: int) -> tuple[float, float]:
+    """Return the time (in ms) spent to coordinate the end of a test."""
+
+    with multiprocessing.Manager() as manager:
+        scopes = legacy_scopes(manager, nb_tests)
+        tstart = time.perf_counter()
+        for _ in range(nb_tests):
+            legacy_finish_test(scopes)
+        legacy = time.perf_counter() - tstart
+
+    with CoordinatorManager() as manager:
+        coordinator = manager.ScopeCoordinator()
+        coordinator.add_tests({scope_id: nb_tests for scope_id in SCOPES})
+        tstart = time.perf_counter()
+        for _ in range(nb_tests):
+            coordinator.finish_test(SCOPES)
+        coordinated = time.perf_counter() - tstart
+
+    return legacy * 1000 / nb_tests, coordinated * 1000 / nb_tests
+
+
+if __name__ == "__main__":
+
+    nb_tests = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    legacy, coordinated = measure(nb_tests)
+
+    print(f"{nb_tests} tests, {len(SCOPES)} scopes per test")
+    print(f"{'Manager proxies':>16}: {legacy:6.3f} ms per test")
+    print(f"{'ScopeCoordinator':>16}: {coordinated:6.3f} ms per test")
@@ -1,15 +1,16 @@
-from multiprocessing.managers import DictProxy
-import queue
+import multiprocessing
 from typing import Union
 
 from lymbo.cm import args
 from lymbo.cm import expand
 from lymbo.cm import expected
 from lymbo.cm import test
+from lymbo.coordinator import ScopeCoordinator
 from lymbo.resource_manager import scope_class
 from lymbo.resource_manager import scope_function
 from lymbo.resource_manager import scope_global
 from lymbo.resource_manager import scope_module
+from lymbo.resource_manager import scope_pool
 
 __version__ = "0.3.0"
 
@@ -22,9 +23,20 @@ __all__ = [
     "scope_function",
     "scope_global",
     "scope_module",
+    "scope_pool",
 ]
 
 
+_coordinator: Union[ScopeCoordinator, None] = None
 _local_resources: Union[dict, None] = None
-_shared_queue: Union[queue.Queue, None] = None
-_shared_scopes: Union[DictProxy, None] = None
+# the resources set up in a worker for the scopes whose tests are all in its group
+_local_scope_names: tuple[str, ...] = ()
+_local_scope_counts: dict[str, int] = {}
+_local_scopes: set[str] = set()
+_worker_resources: dict[str, dict] = {}
+# the shared resources already unpickled by a worker, and the output of their setup
+_resources_cache: dict[str, dict[str, tuple]] = {}
+_resources_cache_hits: int = 0
+_resources_cache_misses: int = 0
+_results_queue: Union[multiprocessing.Queue, None] = None
+_worker_startup: float = 0.0
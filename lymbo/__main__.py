@@ -1,10 +1,18 @@
+import importlib
 import multiprocessing
+import os
 import platform
 import sys
 
 import lymbo
+from lymbo.cache import CollectionCache
 from lymbo.collect import collect_tests
+from lymbo.collect import count_tests
+from lymbo.collect import CollectStats
 from lymbo.config import parse_args
+from lymbo.env import LYMBO_RESOURCE_TIMEOUT
+from lymbo.env import LYMBO_SHARED_MEMORY_MIN_SIZE
+from lymbo.history import TestHistory
 from lymbo.item import TestStatus
 from lymbo.log import set_env_for_logging
 from lymbo.report import TestReport
@@ -13,10 +21,17 @@ from lymbo.run import run_test_plan
 
 def lymbo_entry_point():
 
-    multiprocessing.set_start_method("spawn", force=True)
-
     config = parse_args()
 
+    multiprocessing.set_start_method(config.start_method, force=True)
+    if config.start_method == "forkserver":
+        # the workers are forked from a server which has already imported these modules
+        multiprocessing.set_forkserver_preload(["lymbo.run"] + config.preload)
+    elif config.start_method == "fork":
+        # the workers inherit the modules imported by this process
+        for module_name in config.preload:
+            importlib.import_module(module_name)
+
     set_env_for_logging(config.log_level, config.log)
 
     if config.version:
@@ -28,30 +43,91 @@ def lymbo_entry_point():
     )
 
     print("==== collecting tests")
-    test_plan = collect_tests(config.paths, config.groupby, config.filter)
 
-    if config.collect:
-        test_plan_to_print, _ = test_plan.test_plan(show_status=False)
-        print(test_plan_to_print)
+    if config.collect_count and not config.filter:
+        # without filter, we don't need the name of the tests to count them
+        nb_tests, nb_groups = count_tests(
+            config.paths,
+            config.groupby,
+            config.static_collect,
+            config.include,
+            config.exclude,
+            config.max_params_per_test,
+        )
+        print(
+            f"==== {nb_tests} test{'s' if nb_tests>1 else ''} in {nb_groups} group{'s' if nb_groups>1 else ''}"
+        )
+        sys.exit(0)
 
-    nb_tests, nb_groups = test_plan.count
-    print(
-        f"==== {nb_tests} test{'s' if nb_tests>1 else ''} in {nb_groups} group{'s' if nb_groups>1 else ''}"
+    cache = None if config.no_cache else CollectionCache(config.cache_dir)
+    collect_stats = CollectStats()
+    test_plan = collect_tests(
+        config.paths,
+        config.groupby,
+        config.filter,
+        cache,
+        collect_stats,
+        config.workers,
+        config.static_collect,
+        config.include,
+        config.exclude,
+        config.max_params_per_test,
     )
 
     if config.collect:
+        test_plan_to_print, _ = test_plan.test_plan(
+            show_status=False, show_resources=True
+        )
+        print(test_plan_to_print)
+
+    nb_tests, nb_groups = test_plan.count
+    collect_summary = f"==== {nb_tests} test{'s' if nb_tests>1 else ''} in {nb_groups} group{'s' if nb_groups>1 else ''}"
+    if cache:
+        collect_summary += f" (cache: {collect_stats.cache_hits} hit{'s' if collect_stats.cache_hits>1 else ''}, {collect_stats.cache_misses} miss{'es' if collect_stats.cache_misses>1 else ''})"
+    if config.static_collect:
+        collect_summary += f" (static: {collect_stats.executed_modules} module{'s' if collect_stats.executed_modules>1 else ''} executed)"
+    print(collect_summary)
+
+    if config.collect or config.collect_count:
         sys.exit(0)
 
     if nb_tests == 0:
         sys.exit(5)
 
-    _ = TestReport(config.report)
+    _ = TestReport(config.report, config.report_mode)
+
+    os.environ[LYMBO_RESOURCE_TIMEOUT] = str(config.resource_timeout)
+    if config.shared_memory_min_size is not None:
+        os.environ[LYMBO_SHARED_MEMORY_MIN_SIZE] = str(config.shared_memory_min_size)
+
+    history = None if config.no_history else TestHistory(config.cache_dir)
+
+    uuids = [test.uuid for tests in test_plan for test in tests]
 
     print("==== running tests")
 
-    duration = run_test_plan(test_plan, config.workers)
+    run_summary = run_test_plan(
+        test_plan,
+        config.workers,
+        history.expected_durations(uuids) if history else None,
+        config.schedule,
+        config.max_live_resources,
+        config.prewarm,
+        config.local_resources,
+    )
+
+    duration = run_summary.duration
+    print(
+        f"\n==== tests executed in {duration} second{'s' if duration>1 else ''}"
+        f" (scopes prepared in {run_summary.prepare_scopes:.3f}s)"
+        f" (workers started in {run_summary.workers_startup:.3f}s)"
+        f" (tail: {run_summary.tail_latency:.3f}s)"
+    )
 
-    print(f"\n==== tests executed in {duration} second{'s' if duration>1 else ''}")
+    if config.prewarm:
+        print("==== resources")
+        for resource, setup in run_summary.resources_setup.items():
+            print(f"- {resource} set up in {setup:.3f}s")
 
     print("==== results")
     test_plan_to_print, tests_status = test_plan.test_plan(show_status=True)
@@ -61,6 +137,19 @@ def lymbo_entry_point():
         f"==== {''.join([(f'{nb} {status.value} ') for status, nb in tests_status.items() if nb > 0])} "
     )
 
+    if history:
+        history.add(test_plan)
+
+        if config.slowest:
+            print("==== slowest tests")
+            for durations in history.slowest(config.slowest, uuids):
+                print(
+                    f"- {durations.name} p50={durations.p50:.3f}s p95={durations.p95:.3f}s"
+                    f" ({durations.runs} run{'s' if durations.runs>1 else ''})"
+                )
+
+        history.close()
+
     if (tests_status[TestStatus.BROKEN] > 0) or (tests_status[TestStatus.FAILED] > 0):
         print("==== failures")
 
@@ -0,0 +1,107 @@
+import contextlib
+from multiprocessing import shared_memory
+import sys
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+from lymbo.log import logger
+
+# the shared memory blocks attached by this process, by name
+_attached: dict[str, shared_memory.SharedMemory] = {}
+
+
+class SharedBuffer(NamedTuple):
+    """A resource copied in a shared memory block, sent to the workers instead of the resource."""
+
+    name: str  # the name of the shared memory block
+    nbytes: int
+    format: str
+    shape: tuple[int, ...]
+
+
+def share_buffer(
+    resource: Any, min_size: int
+) -> Optional[tuple[SharedBuffer, contextlib.ExitStack]]:
+    """Copy a resource which supports the buffer protocol (bytes, bytearray, array, numpy array...)
+    in a shared memory block, if its size is at least min_size bytes.
+
+    Return the description of the block and the context manager which frees it
+    at the teardown of the scope, or None if the resource is not shared this way.
+    """
+
+    try:
+        view = memoryview(resource)
+    except TypeError:
+        return None  # not a buffer
+
+    if (view.nbytes < max(min_size, 1)) or not view.c_contiguous:
+        return None
+
+    try:
+        block = shared_memory.SharedMemory(create=True, size=view.nbytes)
+    except OSError as ex:
+        logger().debug(
+            f"share_buffer - can't create a shared memory block of {view.nbytes} bytes - exception=[{ex}]"
+        )
+        return None  # the resource is pickled
+
+    release = contextlib.ExitStack()
+    release.callback(block.unlink)
+    release.callback(block.close)
+
+    shape = view.shape or ()
+
+    try:
+        buffer = _buffer(block)
+        buffer[: view.nbytes] = view.cast("B")
+        # the workers must be able to rebuild the same view
+        buffer[: view.nbytes].cast(view.format, shape).release()  # type: ignore[call-overload]
+    except (TypeError, ValueError) as ex:
+        logger().debug(
+            f"share_buffer - can't share a buffer with the format [{view.format}] - exception=[{ex}]"
+        )
+        release.close()
+        return None
+
+    return SharedBuffer(block.name, view.nbytes, view.format, shape), release
+
+
+def attach_buffer(shared_buffer: SharedBuffer) -> memoryview:
+    """Map a shared memory block, only once per process, and return a read-only view of the resource."""
+
+    block = _attached.get(shared_buffer.name)
+
+    if block is None:
+        # the block is unlinked by the resource manager which has created it
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=shared_buffer.name, track=False)
+        else:
+            # the workers share the resource tracker of the resource manager, which
+            # keeps a single registration of the block, removed when it is unlinked
+            block = shared_memory.SharedMemory(name=shared_buffer.name)
+        _attached[shared_buffer.name] = block
+
+    return (
+        _buffer(block)[: shared_buffer.nbytes]
+        .cast(shared_buffer.format, shared_buffer.shape)  # type: ignore[call-overload]
+        .toreadonly()
+    )
+
+
+def _buffer(block: shared_memory.SharedMemory) -> memoryview:
+    assert block.buf is not None, f"the shared memory block {block.name} is closed"
+    return block.buf
+
+
+def detach_buffer(name: str):
+    """Unmap a shared memory block attached by this process."""
+
+    block = _attached.get(name)
+
+    if block is not None:
+        try:
+            block.close()
+        except BufferError:
+            return  # a view of the resource is still used, keep it mapped
+        del _attached[name]
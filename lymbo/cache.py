@@ -0,0 +1,105 @@
+import hashlib
+import os
+from pathlib import Path
+import pickle
+from typing import Optional
+from typing import Union
+
+import lymbo
+from lymbo.item import GroupBy
+from lymbo.item import TestItem
+from lymbo.log import logger
+
+# to invalidate the entries saved with a previous layout of the tests
+CACHE_FORMAT = 2
+
+
+def file_stamp(path: Path) -> tuple[int, int, str]:
+    """Return the modification time, the size and the hash of a file."""
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+    return stat.st_mtime_ns, stat.st_size, sha256
+
+
+class CollectionCache:
+    """Store the tests collected from a file, until this file or one of the
+    local modules it imports, directly or not, is modified."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path) / "collect"
+        os.makedirs(self.path, exist_ok=True)
+
+    def entry_path(
+        self, path: Path, group_by: GroupBy, max_params_per_test: Optional[int] = None
+    ) -> Path:
+        key = f"{path.absolute()}::{group_by.value}"
+        if max_params_per_test:
+            # the collection fails if a test has too many parameters
+            key += f"::{max_params_per_test}"
+        return self.path / f"{hashlib.sha1(key.encode()).hexdigest()}.pickle"
+
+    def get(
+        self, path: Path, group_by: GroupBy, max_params_per_test: Optional[int] = None
+    ) -> Union[list[list[TestItem]], None]:
+        """Return the tests collected from this file, or None if the file
+        is not in the cache or if the cache entry is out of date."""
+
+        entry_path = self.entry_path(path, group_by, max_params_per_test)
+
+        if not entry_path.exists():
+            return None
+
+        try:
+            with open(entry_path, "rb") as f:
+                entry = pickle.load(f)
+
+            if (entry["lymbo"], entry.get("format")) != (
+                lymbo.__version__,
+                CACHE_FORMAT,
+            ):
+                return None
+
+            for filename, (mtime_ns, size, sha256) in entry["files"].items():
+                stat = os.stat(filename)
+                if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                    # the file has been touched, but its content may be the same
+                    if file_stamp(Path(filename))[2] != sha256:
+                        return None
+
+            return pickle.loads(entry["tests"])
+        except Exception as ex:
+            logger().debug(f"CollectionCache.get - {path} - exception=[{ex}]")
+            return None
+
+    def set(
+        self,
+        path: Path,
+        group_by: GroupBy,
+        tests: list[list[TestItem]],
+        dependencies: list[Path],
+        max_params_per_test: Optional[int] = None,
+    ):
+        """Save the tests collected from this file."""
+
+        entry_path = self.entry_path(path, group_by, max_params_per_test)
+
+        try:
+            entry = {
+                "lymbo": lymbo.__version__,
+                "format": CACHE_FORMAT,
+                "files": {
+                    str(filename.absolute()): file_stamp(filename)
+                    for filename in [path] + dependencies
+                },
+                "tests": pickle.dumps(tests),
+            }
+        except Exception as ex:
+            # the parameters of a test may not be serializable
+            logger().debug(f"CollectionCache.set - {path} - exception=[{ex}]")
+            return
+
+        with open(f"{entry_path}.tmp", "wb") as f:
+            pickle.dump(entry, f)
+
+        os.replace(f"{entry_path}.tmp", entry_path)
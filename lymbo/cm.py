@@ -1,8 +1,11 @@
 import contextlib
 from dataclasses import dataclass
+import itertools
+import math
 import os
 import re
 from typing import Any
+from typing import Iterator
 from typing import Type
 from typing import Optional
 from typing import Union
@@ -25,34 +28,44 @@ def args(*args, **kwargs):
 
     if LYMBO_TEST_COLLECTION in os.environ:
 
-        flattened_params = [(args, kwargs)]
-
-        pos = 0
-        for arg in args:
-            if type(arg) is ArgParams:
-                new_flattened_params = []
-                for elt in arg.args:
-                    for params in flattened_params:
-                        gargs, gkwargs = params
-                        gargs = list(gargs)
-                        gargs[pos] = elt
-                        gargs = tuple(gargs)
-                        new_flattened_params.append((gargs, gkwargs))
-                flattened_params = new_flattened_params
-            pos += 1
-
-        for key, value in kwargs.items():
-            if type(value) is ArgParams:
-                new_flattened_params = []
-                for elt in value.args:
-                    for params in flattened_params:
-                        gargs, gkwargs = params
-                        gkwargs = gkwargs.copy()
-                        gkwargs[key] = elt
-                        new_flattened_params.append((gargs, gkwargs))
-                flattened_params = new_flattened_params
-
-        return flattened_params
+        return ExpandedArgs(args, kwargs)
+
+
+class ExpandedArgs:
+    """The parameters of a test, expanded lazily.
+
+    Each combination of the expanded values is built only when it is iterated,
+    and the number of combinations is known without building them.
+    """
+
+    def __init__(self, args: tuple, kwargs: dict[str, Any]):
+        self.args = args
+        self.kwargs = kwargs
+
+        # the position (or the name) of each expanded parameter, with its values
+        self.expanded: list[tuple[Union[int, str], list]] = [
+            (pos, arg.args) for pos, arg in enumerate(args) if type(arg) is ArgParams
+        ] + [
+            (key, value.args)
+            for key, value in kwargs.items()
+            if type(value) is ArgParams
+        ]
+
+    def __len__(self) -> int:
+        return math.prod(len(values) for _, values in self.expanded)
+
+    def __iter__(self) -> Iterator[tuple[tuple, dict[str, Any]]]:
+        # the first expanded parameter changes first
+        expanded = list(reversed(self.expanded))
+        for combination in itertools.product(*[values for _, values in expanded]):
+            gargs = list(self.args)
+            gkwargs = self.kwargs.copy()
+            for (key, _), value in zip(expanded, combination):
+                if isinstance(key, int):
+                    gargs[key] = value
+                else:
+                    gkwargs[key] = value
+            yield tuple(gargs), gkwargs
 
 
 @dataclass
@@ -1,46 +1,120 @@
 import ast
-import glob
+import concurrent.futures
+import contextlib
+from dataclasses import dataclass
+import fnmatch
+import functools
 import importlib
 import os
 from pathlib import Path
 import sys
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import TypeVar
 from typing import Union
 from unittest.mock import patch
 
+from lymbo.cache import CollectionCache
 from lymbo.config import GroupBy
+from lymbo.env import LYMBO_MAX_PARAMS_PER_TEST
 from lymbo.env import LYMBO_TEST_COLLECTION
-from lymbo.exception import LymboExceptionFilter
+from lymbo.exception import LymboExceptionNotLiteral
+from lymbo.exception import LymboExceptionParameters
+from lymbo.filter import compile_filter
+from lymbo.filter import tokenize
+from lymbo.item import ResourceUsage
 from lymbo.item import TestItem
 from lymbo.item import TestPlan
 from lymbo.log import trace_call
 from lymbo.log import logger
-
+from lymbo.static import LiteralEvaluator
 
 from lymbo.cm import args
 
+T = TypeVar("T")
+
+
+@dataclass
+class CollectStats:
+    """Counters about the test collection."""
+
+    cache_hits: int = 0
+    cache_misses: int = 0
+    executed_modules: int = 0  # with a static collection, the modules not literal
+
 
 @trace_call
 def collect_tests(
-    paths: list[Path], group_by: GroupBy, filter_by_path: str = ""
+    paths: list[Path],
+    group_by: GroupBy,
+    filter_by_path: str = "",
+    cache: Union[CollectionCache, None] = None,
+    stats: Union[CollectStats, None] = None,
+    max_workers: Union[int, None] = 1,
+    static: bool = False,
+    include: Union[list[str], None] = None,
+    exclude: Union[list[str], None] = None,
+    max_params_per_test: Union[int, None] = None,
 ) -> TestPlan:
-    """Collect all the functions/methods decorated with @lymbo.test."""
+    """Collect all the functions/methods decorated with @lymbo.test.
 
-    tests = []
-    filtered_tests = []
+    The files are parsed by max_workers processes in parallel (default = 1,
+    None = number of CPU), then their tests are merged in the order of the files.
+
+    With static=True, a module is executed only if its decorators can't be
+    evaluated from the AST.
 
-    os.environ[LYMBO_TEST_COLLECTION] = "1"
+    The include/exclude glob patterns select the files (see list_python_files).
 
-    for path in list_python_files(paths):
+    A test expanded into more than max_params_per_test parameters raises
+    a LymboExceptionParameters.
+    """
 
-        tests += list_tests_from_file(path, group_by)
+    filtered_tests = []
 
-    del os.environ[LYMBO_TEST_COLLECTION]
+    if stats is None:
+        stats = CollectStats()
+
+    if filter_by_path:
+        match = compile_filter(filter_by_path)  # a broken filter fails here
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    environ = {LYMBO_TEST_COLLECTION: "1"}
+    if max_params_per_test:
+        environ[LYMBO_MAX_PARAMS_PER_TEST] = str(max_params_per_test)
+
+    # the environment is restored even if the collection fails
+    with patch.dict(os.environ, environ):
+        tests = _collect_files(
+            paths,
+            group_by,
+            cache,
+            stats,
+            max_workers,
+            static,
+            include,
+            exclude,
+            max_params_per_test,
+        )
+
+    # the tests with the same name (a decorator used twice) must have different ids
+    uuids: dict[str, int] = {}
+    for group in tests:
+        for test in group:
+            nb = uuids.get(test.uuid, 0)
+            uuids[test.uuid] = nb + 1
+            if nb:
+                test.uuid = f"{test.uuid}-{nb}"
 
     if filter_by_path:
         for group in tests:
             new_group = []
             for test in group:
-                if match_filter(str(test), filter_by_path):
+                if match(str(test)):
                     new_group.append(test)
                 else:
                     logger().debug(f"collect_tests - {str(test)} has been filtered.")
@@ -55,44 +129,256 @@ def collect_tests(
     return test_plan
 
 
+@trace_call
+def count_tests(
+    paths: list[Path],
+    group_by: GroupBy,
+    static: bool = False,
+    include: Union[list[str], None] = None,
+    exclude: Union[list[str], None] = None,
+    max_params_per_test: Union[int, None] = None,
+) -> tuple[int, int]:
+    """Count the tests and the groups, without expanding the parameters
+    of the tests (see collect_tests for the arguments)."""
+
+    nb_tests = 0
+    nb_groups = 0
+
+    environ = {LYMBO_TEST_COLLECTION: "1"}
+    if max_params_per_test:
+        environ[LYMBO_MAX_PARAMS_PER_TEST] = str(max_params_per_test)
+
+    # the environment is restored even if the count fails
+    with patch.dict(os.environ, environ):
+        for path in list_python_files(paths, include, exclude):
+            (nb_tests_in_file, nb_groups_in_file), _ = parse_file(
+                path,
+                static,
+                lambda tree, evaluate: count_body(
+                    group_by, tree.body, path, None, evaluate
+                ),
+            )
+            nb_tests += nb_tests_in_file
+            if group_by == GroupBy.MODULE:
+                nb_groups += min(nb_tests_in_file, 1)
+            else:
+                nb_groups += nb_groups_in_file
+
+    return nb_tests, nb_groups
+
+
 ## List tests
 
 
+def _collect_files(
+    paths: list[Path],
+    group_by: GroupBy,
+    cache: Union[CollectionCache, None],
+    stats: CollectStats,
+    max_workers: int,
+    static: bool,
+    include: Union[list[str], None],
+    exclude: Union[list[str], None],
+    max_params_per_test: Union[int, None],
+) -> list[list[TestItem]]:
+    """Collect the tests of the files, from the cache or by parsing them (see collect_tests)."""
+
+    tests: list[list[TestItem]] = []
+
+    # the tests of each file, in the order of the files (None if not collected yet)
+    tests_by_file: list[Union[list[list[TestItem]], None]] = []
+    misses: list[tuple[int, Path]] = []
+
+    with contextlib.ExitStack() as stack:
+
+        collect_executor = None
+        futures: dict[int, concurrent.futures.Future] = {}
+
+        for path in list_python_files(paths, include, exclude):
+            tests_from_file = (
+                cache.get(path, group_by, max_params_per_test) if cache else None
+            )
+            if tests_from_file is None:
+                if cache:
+                    stats.cache_misses += 1
+                misses.append((len(tests_by_file), path))
+                if (max_workers > 1) and (len(misses) > 1):
+                    if collect_executor is None:
+                        # the files are collected while we continue to walk the tree
+                        collect_executor = stack.enter_context(
+                            concurrent.futures.ProcessPoolExecutor(
+                                max_workers=max_workers
+                            )
+                        )
+                        # the first miss, held back until a second one
+                        index, miss = misses[0]
+                        futures[index] = collect_executor.submit(
+                            collect_file, miss, group_by, static
+                        )
+                    index, miss = misses[-1]
+                    futures[index] = collect_executor.submit(
+                        collect_file, miss, group_by, static
+                    )
+            else:
+                stats.cache_hits += 1
+            tests_by_file.append(tests_from_file)
+
+        for index, path in misses:
+            if index in futures:
+                try:
+                    tests_by_file[index], executed = futures[index].result()
+                    stats.executed_modules += executed
+                except Exception as ex:
+                    # the tests may not be serializable, or the file is broken:
+                    # in both cases we collect it again in this process
+                    logger().debug(
+                        f"collect_tests - {path} not collected by a worker - exception=[{ex}]"
+                    )
+
+    for index, path in misses:
+        tests_from_file = tests_by_file[index]
+        if tests_from_file is None:
+            tests_from_file, executed = collect_file(path, group_by, static)
+            tests_by_file[index] = tests_from_file
+            stats.executed_modules += executed
+        if cache:
+            cache.set(
+                path,
+                group_by,
+                tests_from_file,
+                local_dependencies(path),
+                max_params_per_test,
+            )
+
+    for tests_from_file in tests_by_file:
+        if tests_from_file:
+            tests += tests_from_file
+
+    return tests
+
+
+def match_patterns(path: str, name: str, patterns: list[str]) -> bool:
+    """Indicate if the path (relative to the walked directory) or the name of
+    a file match one of these glob patterns."""
+    return any(
+        fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern)
+        for pattern in patterns
+    )
+
+
 @trace_call
-def list_python_files(paths: list[Path]) -> list[Path]:
-    """Walk into all directories and subdirectories to list the Python files."""
-    tests_files = []
+def list_python_files(
+    paths: list[Path],
+    include: Union[list[str], None] = None,
+    exclude: Union[list[str], None] = None,
+) -> Iterator[Path]:
+    """Walk into all directories and subdirectories to list the Python files.
+
+    The files are yielded as soon as they are found, sorted by name in each
+    directory. In a directory, only the files matching one of the include
+    patterns (default = *.py) and none of the exclude patterns are listed,
+    and the directories matching one of the exclude patterns are not walked.
+    The hidden entries and the directories starting with "__" are always ignored.
+    """
+    include = include if include else ["*.py"]
+    exclude = exclude if exclude else []
+
+    already_listed = set()
+
     for path in paths:
-        if path.is_file() and path.name.endswith(".py"):
-            tests_files.append(path)
+        if path.is_file():
+            if path.name.endswith(".py") and (path.absolute() not in already_listed):
+                already_listed.add(path.absolute())
+                yield path
         elif path.is_dir():
-            if not path.name.startswith("__"):
-                for p in glob.glob(f"{path}/**"):
-                    tests_files += list_python_files(
-                        [
-                            Path(p),
-                        ]
-                    )
-    return list(set(tests_files))
+            # a stack of directories to walk, with their path relative to the root
+            directories = [(str(path), "")]
+            while directories:
+                directory, relative_directory = directories.pop()
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+                subdirectories = []
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    relative_path = f"{relative_directory}{entry.name}"
+                    if match_patterns(relative_path, entry.name, exclude):
+                        continue
+                    if entry.is_dir():
+                        if not entry.name.startswith("__"):
+                            subdirectories.append((entry.path, f"{relative_path}/"))
+                    elif entry.is_file() and match_patterns(
+                        relative_path, entry.name, include
+                    ):
+                        file_path = Path(entry.path)
+                        if file_path.absolute() not in already_listed:
+                            already_listed.add(file_path.absolute())
+                            yield file_path
+                # depth first, in alphabetical order
+                directories += reversed(subdirectories)
+
+
+def collect_file(
+    path: Path, group_by: GroupBy, static: bool = False
+) -> tuple[list[list[TestItem]], bool]:
+    """List the tests defined in a file.
+
+    Unlike list_tests_from_file, this function can be sent to a worker process."""
+    return list_tests_from_file(path, group_by, static)
 
 
 @trace_call
-def list_tests_from_file(path: Path, group_by: GroupBy) -> list[list[TestItem]]:
-    """List all the tests defined in a file."""
+def list_tests_from_file(
+    path: Path, group_by: GroupBy, static: bool = False
+) -> tuple[list[list[TestItem]], bool]:
+    """List all the tests defined in a file.
 
-    collected_tests = []
+    With static=True, the module is executed only if the arguments of its
+    decorators are not literals. Return the tests and if the module has been executed.
+    """
+
+    tests, executed = parse_file(
+        path,
+        static,
+        lambda tree, evaluate: parse_body(group_by, tree.body, path, None, evaluate),
+    )
+
+    if group_by == GroupBy.MODULE:
+        tests = [[test[0] for test in tests]] if tests else []
+
+    return tests, executed
+
+
+def parse_file(
+    path: Path,
+    static: bool,
+    parse: Callable[[ast.Module, Callable[[ast.expr], Any]], T],
+) -> tuple[T, bool]:
+    """Parse a file with the parse function, which receives the AST of the module
+    and a function to evaluate the arguments of the decorators.
+
+    With static=True, the module is executed only if the arguments of its
+    decorators are not literals. Return the result of parse and if the module
+    has been executed.
+    """
 
     with open(path) as f:
         source = f.read()
 
+    tree = ast.parse(source, path)
+
+    if static:
+        try:
+            return parse(tree, LiteralEvaluator(tree)), False
+        except LymboExceptionNotLiteral as ex:
+            logger().info(f"parse_file - {path} must be executed - {ex}")
+
     syspath = sys.path + [
         str(path.parent.absolute()),
     ]
 
     with patch.object(sys, "path", syspath):
 
-        tree = ast.parse(source, path)
-
         # get the context
         imports = extract_imports(tree)
         global_vars = dynamic_import_modules(
@@ -105,13 +391,90 @@ def list_tests_from_file(path: Path, group_by: GroupBy) -> list[list[TestItem]]:
             compiled_code, global_vars, local_vars
         )  # we execute the module to retrieve the global and local vars
 
-        tests = parse_body(group_by, tree.body, path, None, global_vars, local_vars)
-        if group_by == GroupBy.MODULE:
-            collected_tests.append([test[0] for test in tests])
-        else:
-            collected_tests += tests
+        return (
+            parse(
+                tree,
+                functools.partial(
+                    eval_ast_call, global_vars=global_vars, local_vars=local_vars
+                ),
+            ),
+            True,
+        )
+
 
-    return collected_tests
+def find_test_decorators(
+    item: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+) -> Iterator[tuple[Union[ast.expr, None], Union[ast.expr, None]]]:
+    """Find the lymbo.test decorators of a function, and return
+    the AST of their args and expected arguments."""
+    for decorator in item.decorator_list:
+        if isinstance(decorator, ast.Call):
+            if isinstance(decorator.func, ast.Attribute):
+                if decorator.func.attr == "test":
+                    if getattr(decorator.func.value, "id", None) == "lymbo":
+
+                        args_call = None
+                        expected = None
+
+                        if decorator.args:
+                            args_call = decorator.args[0]
+                            if len(decorator.args) == 2:
+                                expected = decorator.args[1]
+
+                        for kw in decorator.keywords:
+                            if kw.arg == "args":
+                                args_call = kw.value
+                            if kw.arg == "expected":
+                                expected = kw.value
+
+                        yield args_call, expected
+
+
+SCOPES = ("global", "module", "class", "function", "pool")
+
+
+def find_resources(
+    item: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+) -> tuple[ResourceUsage, ...]:
+    """Find the resources shared in a scope by a test function,
+    used directly in its body with: with scope_<scope>(cm, *args, **kwargs)"""
+    resources = []
+    for node in ast.walk(item):
+        if isinstance(node, (ast.With, ast.AsyncWith)):
+            for withitem in node.items:
+                call = withitem.context_expr
+                if not (isinstance(call, ast.Call) and call.args):
+                    continue
+
+                if isinstance(call.func, ast.Name):
+                    name = call.func.id
+                elif isinstance(call.func, ast.Attribute) and (
+                    getattr(call.func.value, "id", None) == "lymbo"
+                ):
+                    name = call.func.attr
+                else:
+                    continue
+
+                if not (name.startswith("scope_") and name[6:] in SCOPES):
+                    continue
+
+                args: Optional[tuple] = None
+                kwargs: Optional[dict] = None
+                try:
+                    if all(keyword.arg for keyword in call.keywords):  # no **kwargs
+                        args = tuple(ast.literal_eval(arg) for arg in call.args[1:])
+                        kwargs = {
+                            keyword.arg: ast.literal_eval(keyword.value)
+                            for keyword in call.keywords
+                        }
+                except (ValueError, TypeError, SyntaxError):
+                    args, kwargs = None, None
+
+                resources.append(
+                    ResourceUsage(name[6:], ast.unparse(call.args[0]), args, kwargs)
+                )
+
+    return tuple(resources)
 
 
 def parse_body(
@@ -119,71 +482,56 @@ def parse_body(
     body: list[ast.stmt],
     path: Path,
     classdef: Union[ast.ClassDef, None],
-    global_vars,
-    local_vars,
+    evaluate: Callable[[ast.expr], Any],
 ) -> list[list[TestItem]]:
-    """Parse the body a module/class to find test."""
+    """Parse the body a module/class to find test.
+
+    The arguments of the decorators are evaluated using the evaluate function."""
     collected_tests = []
     for item in body:
         if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            for decorator in item.decorator_list:
-                if isinstance(decorator, ast.Call):
-                    if isinstance(decorator.func, ast.Attribute):
-                        if decorator.func.attr == "test":
-                            if getattr(decorator.func.value, "id", None) == "lymbo":
-
-                                args_call = None
-                                expected = None
-
-                                if decorator.args:
-                                    args_call = decorator.args[0]
-                                    if len(decorator.args) == 2:
-                                        expected = decorator.args[1]
-
-                                for kw in decorator.keywords:
-                                    if kw.arg == "args":
-                                        args_call = kw.value
-                                    if kw.arg == "expected":
-                                        expected = kw.value
-
-                                if args_call:
-                                    flattened_args = eval_ast_call(
-                                        args_call, global_vars, local_vars
-                                    )
-                                else:
-                                    flattened_args = args()
-
-                                expected_assertion = None
-                                if expected:
-                                    expected_assertion = eval_ast_call(
-                                        expected, global_vars, local_vars
-                                    )
-
-                                tests = []
-                                for f_args in flattened_args:
-                                    tests.append(
-                                        [
-                                            TestItem(
-                                                path,
-                                                isinstance(item, ast.AsyncFunctionDef),
-                                                item.name,
-                                                f_args,
-                                                classdef.name if classdef else None,
-                                                expected_assertion,
-                                            ),
-                                        ]
-                                    )
-                                if (len(tests) > 1) and (group_by == GroupBy.FUNCTION):
-                                    collected_tests.append([test[0] for test in tests])
-                                else:
-                                    # error: Argument 1 to "extend" of "list" has
-                                    # incompatible type "list[list[TestItem]]"; expected
-                                    # "Iterable[list[list[TestItem]]]"
-                                    collected_tests.extend(tests)  # type: ignore[arg-type]
+            for args_call, expected in find_test_decorators(item):
+
+                if args_call:
+                    flattened_args = evaluate(args_call)
+                else:
+                    flattened_args = args()
+
+                check_max_params(path, classdef, item, len(flattened_args))
+
+                expected_assertion = None
+                if expected:
+                    expected_assertion = evaluate(expected)
+
+                resources = find_resources(item)
+
+                tests = []
+                for f_args in flattened_args:
+                    tests.append(
+                        [
+                            TestItem(
+                                path,
+                                isinstance(item, ast.AsyncFunctionDef),
+                                item.name,
+                                f_args,
+                                classdef.name if classdef else None,
+                                expected_assertion,
+                                resources,
+                            ),
+                        ]
+                    )
+                if (len(tests) > 1) and (group_by == GroupBy.FUNCTION):
+                    collected_tests.append([test[0] for test in tests])
+                else:
+                    # error: Argument 1 to "extend" of "list" has
+                    # incompatible type "list[list[TestItem]]"; expected
+                    # "Iterable[list[list[TestItem]]]"
+                    collected_tests.extend(tests)  # type: ignore[arg-type]
         elif isinstance(item, ast.ClassDef):
-            tests = parse_body(group_by, item.body, path, item, global_vars, local_vars)
+            tests = parse_body(group_by, item.body, path, item, evaluate)
             if group_by == GroupBy.CLASS:
-                collected_tests.append([test[0] for test in tests])
+                if tests:
+                    collected_tests.append([test[0] for test in tests])
             else:
                 # error: Argument 1 to "extend" of "list" has incompatible
                 # type "list[list[TestItem]]"; expected "Iterable[list[list[TestItem]]]"
@@ -192,6 +540,56 @@ def parse_body(
     return collected_tests
 
 
+def check_max_params(
+    path: Path,
+    classdef: Union[ast.ClassDef, None],
+    item: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+    nb_params: int,
+):
+    """Raise a LymboExceptionParameters if a test has more parameters than
+    the maximum set in the environment."""
+    max_params = int(os.environ.get(LYMBO_MAX_PARAMS_PER_TEST, 0))
+    if max_params and (nb_params > max_params):
+        raise LymboExceptionParameters(
+            f"The test {path}::{classdef.name + '::' if classdef else ''}{item.name}"
+            f" has {nb_params} parameters, the maximum is {max_params}."
+        )
+
+
+def count_body(
+    group_by: GroupBy,
+    body: list[ast.stmt],
+    path: Path,
+    classdef: Union[ast.ClassDef, None],
+    evaluate: Callable[[ast.expr], Any],
+) -> tuple[int, int]:
+    """Count the tests and the groups of a module/class, like parse_body
+    but without expanding the parameters."""
+    nb_tests = 0
+    nb_groups = 0
+    for item in body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for args_call, _ in find_test_decorators(item):
+                nb = len(evaluate(args_call)) if args_call else 1
+                check_max_params(path, classdef, item, nb)
+                nb_tests += nb
+                if (nb > 1) and (group_by == GroupBy.FUNCTION):
+                    nb_groups += 1
+                else:
+                    nb_groups += nb
+        elif isinstance(item, ast.ClassDef):
+            nb_tests_in_class, nb_groups_in_class = count_body(
+                group_by, item.body, path, item, evaluate
+            )
+            nb_tests += nb_tests_in_class
+            if group_by == GroupBy.CLASS:
+                nb_groups += min(nb_tests_in_class, 1)
+            else:
+                nb_groups += nb_groups_in_class
+
+    return nb_tests, nb_groups
+
+
 def eval_ast_call(call_node, global_vars, local_vars):
 
     # local_vars and global_vars should be passed in the context
@@ -257,6 +655,45 @@ def extract_imports(tree: ast.Module) -> list[tuple[str, str]]:
     return imports
 
 
+def local_dependencies(path: Path) -> list[Path]:
+    """List the files of the local modules imported by a test file, directly
+    or through other local modules."""
+
+    dependencies: list[Path] = []
+    visited = {path}
+    to_parse = [path]
+
+    while to_parse:
+        module = to_parse.pop(0)
+        try:
+            with open(module) as f:
+                tree = ast.parse(f.read(), module)
+        except (OSError, SyntaxError, ValueError) as ex:
+            # the module is stamped, but its own imports are unknown
+            logger().debug(
+                f"local_dependencies - can't parse {module} - exception=[{ex}]"
+            )
+            continue
+
+        for full_name, _ in extract_imports(tree):
+            parts = full_name.split(".")
+            # for "from module import name", the full name is "module.name"
+            while parts:
+                # the modules are imported from the directory of the test file
+                module_path = path.parent.joinpath(*parts)
+                for candidate in (
+                    module_path.with_name(module_path.name + ".py"),
+                    module_path / "__init__.py",
+                ):
+                    if candidate.is_file() and candidate not in visited:
+                        visited.add(candidate)
+                        dependencies.append(candidate)
+                        to_parse.append(candidate)
+                parts = parts[:-1]
+
+    return dependencies
+
+
 def dynamic_import_modules(imports: list[tuple[str, str]]) -> dict[str, str]:
     """Dynamically imports the modules and returns a dictionary of imported names."""
     global_vars = {}
@@ -286,37 +723,11 @@ def extract_words_from_filter(filter: str) -> list[str]:
     Example: filter = "abc and not (def or ghi)"
              output = ["abc", "def", "ghi"]
     """
-
-    # remove the stop words
-    stop_words = ["(", ")", " and ", " or ", " not ", "(not "]
-    filter = " " + filter
-    for stop_word in stop_words:
-        filter = filter.replace(stop_word, " ")
-
-    # extract words
-    words = set(filter.split(" "))
-
-    return [word for word in words if word != ""]
+    return list(
+        {token.value: None for token in tokenize(filter) if token.kind == "term"}
+    )
 
 
 def match_filter(item: str, filter: str) -> bool:
     """Indicate if this item match with the filter"""
-    words = {word: False for word in extract_words_from_filter(filter)}
-
-    for word in words:
-        words[word] = word in item
-
-    # We sort the list of words to first replace the longer words to have partial
-    # replacement if for example we have these two words: abc and abcdef.
-    new_filter = filter
-    for word in sorted(words, key=len, reverse=True):
-        new_filter = new_filter.replace(word, str(words[word]))
-
-    try:
-        match = eval(new_filter)
-    except Exception as ex:
-        raise LymboExceptionFilter(
-            f'The filter ["{filter}"] is broken. new filter=[{new_filter}] words=[{words}] exception=[{str(ex)}]'
-        )
-
-    return match
+    return compile_filter(filter)(item)
@@ -1,9 +1,35 @@
 import argparse
+import multiprocessing
 from pathlib import Path
 
 from lymbo.item import GroupBy
 from lymbo.item import ReportFailure
 from lymbo.log import LogLevel
+from lymbo.report import ReportMode
+from lymbo.resource_manager import DEFAULT_RESOURCE_TIMEOUT
+from lymbo.resource_manager import LocalResources
+from lymbo.scheduler import ScheduleMode
+
+
+def read_pyproject(path: Path = Path("pyproject.toml")) -> dict:
+    """Read the [tool.lymbo] table of the pyproject.toml file.
+
+    The file is ignored if there is no TOML parser (tomllib is only available
+    with Python 3.11+, or tomli must be installed)."""
+
+    if not path.is_file():
+        return {}
+
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib  # type: ignore[import-not-found,no-redef]
+        except ImportError:
+            return {}
+
+    with open(path, "rb") as f:
+        return tomllib.load(f).get("tool", {}).get("lymbo", {})
 
 
 def parse_args() -> argparse.Namespace:
@@ -70,7 +96,143 @@ def parse_args() -> argparse.Namespace:
         "--filter",
         type=str,
         default="",
-        help="Select only the tests that match this filter (include full path and parameters).",
+        help="Select only the tests that match this filter (include full path and parameters). A filter combines terms, glob patterns (with * or ?) and regular expressions (re:PATTERN) with and, or, not and parentheses.",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=Path(".lymbo_cache"),
+        help="The directory where the collected tests are cached (default = .lymbo_cache).",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Collect all the tests without using the cache.",
+    )
+
+    parser.add_argument(
+        "--static-collect",
+        action="store_true",
+        help="Collect the tests without executing the modules, when the arguments of the decorators are literals.",
+    )
+
+    parser.add_argument(
+        "--include",
+        type=str,
+        action="append",
+        default=[],
+        help="Collect only the files matching this glob pattern (default = *.py). Can be repeated.",
+    )
+
+    parser.add_argument(
+        "--exclude",
+        type=str,
+        action="append",
+        default=[],
+        help="Ignore the files and directories matching this glob pattern. Can be repeated.",
+    )
+
+    parser.add_argument(
+        "--max-params-per-test",
+        type=int,
+        default=None,
+        help="Stop the collection if a test is expanded into more parameters than this maximum.",
+    )
+
+    parser.add_argument(
+        "--collect-count",
+        action="store_true",
+        help="Print the number of tests and exit, without expanding the parameters.",
+    )
+
+    parser.add_argument(
+        "--report-mode",
+        type=ReportMode,
+        choices=ReportMode,
+        default=ReportMode.STREAM,
+        help="Save the results in a single JSON-lines file (stream) or in a JSON file per test (files).",
+    )
+
+    parser.add_argument(
+        "--resource-timeout",
+        type=float,
+        default=DEFAULT_RESOURCE_TIMEOUT,
+        help=f"The maximum time in seconds to wait for the setup of a shared resource (default = {DEFAULT_RESOURCE_TIMEOUT:.0f}).",
+    )
+
+    parser.add_argument(
+        "--start-method",
+        type=str,
+        choices=multiprocessing.get_all_start_methods(),
+        default="spawn",
+        help="The method used to start the worker processes (default = spawn).",
+    )
+
+    parser.add_argument(
+        "--preload",
+        type=str,
+        action="append",
+        default=[],
+        help="Import this module once before starting the workers, with the start methods fork and forkserver. Can be repeated.",
+    )
+
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not use nor save the durations of the tests in the cache directory.",
+    )
+
+    parser.add_argument(
+        "--slowest",
+        type=int,
+        default=0,
+        help="Print the slowest tests, with their median and 95th percentile durations over the last runs.",
+    )
+
+    parser.add_argument(
+        "--schedule",
+        type=ScheduleMode,
+        choices=ScheduleMode,
+        default=ScheduleMode.DURATION,
+        help="Execute the longest groups first (duration), or the groups of a module then of a class one after the other (scope).",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--max-live-resources",
+        type=int,
+        default=None,
+        help="The maximum number of resources shared in the global, module and class scopes alive at once. The groups are scheduled by scope (--schedule=scope).",
+    )
+
+    parser.add_argument(
+        "--prewarm",
+        action="store_true",
+        help="Start the setup of the resources shared in the global and the module scopes in parallel, before the tests ask for them. With --max-live-resources, only the resources of the global scope are pre-warmed.",
+    )
+
+    parser.add_argument(
+        "--local-resources",
+        type=LocalResources,
+        choices=LocalResources,
+        default=LocalResources.FUNCTION,
+        help="Set up the resources in the worker, without pickling them, for the scopes up to this one whose tests are all in the same group.",
+    )
+
+    parser.add_argument(
+        "--shared-memory-min-size",
+        type=int,
+        default=None,
+        help="Share the resources which support the buffer protocol (bytes, arrays...) of at least this size in bytes through shared memory, without copying them. The tests receive a read-only memoryview.",
+    )
+
+    config = parser.parse_args()
+
+    # the patterns defined in pyproject.toml are completed by the command line
+    pyproject = read_pyproject()
+    config.include = pyproject.get("include", []) + config.include
+    config.exclude = pyproject.get("exclude", []) + config.exclude
+    config.preload = pyproject.get("preload", []) + config.preload
+
+    return config
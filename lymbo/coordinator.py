@@ -0,0 +1,207 @@
+from collections import Counter
+from collections import deque
+from multiprocessing.managers import SyncManager
+import threading
+from typing import Callable
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+
+class ScopeCoordinator:
+    """Count the tests remaining in each scope and keep the resources shared in a scope.
+
+    The coordinator lives in the manager process. Each method is a single
+    message from a worker or a resource manager, whatever the number of scopes
+    it updates.
+
+    It also delivers the messages to the resource managers: the setup requests,
+    shared by all the resource managers, and the scopes closed since the last
+    message, in the inbox of each resource manager which holds their resources.
+    """
+
+    def __init__(self) -> None:
+        # the manager serves each process in its own thread
+        self.lock = threading.Lock()
+        self.resource_ready = threading.Condition(self.lock)
+        self.counts: Counter[str] = Counter()  # number of tests remaining by scope
+        self.resources: dict[str, dict[str, Optional[bytes]]] = {}
+        self.outputs: dict[str, dict[str, str]] = {}
+        self.setup_durations: dict[str, float] = {}  # by "resource_id (scope_id)"
+        # the instances of each pool: the number created and the indexes not leased
+        self.pools: dict[str, dict[str, Tuple[int, list[int]]]] = {}
+        self.message_ready = threading.Condition(self.lock)
+        self.messages: deque[dict] = deque()  # the setup requests
+        self.owners: dict[str, set[str]] = {}  # the resource managers by scope
+        self.inboxes: dict[str, list[str]] = {}  # the closed scopes by resource manager
+
+    def add_tests(self, counts: Mapping[str, int]):
+        """Add the number of tests which will be executed in each scope."""
+        with self.lock:
+            self.counts.update(counts)
+
+    def finish_test(
+        self, scope_ids: Iterable[str], watched: Iterable[str] = ()
+    ) -> list[str]:
+        """A test has been executed in these scopes.
+
+        Return the scopes without remaining test among these scopes and the watched scopes.
+        """
+        scope_ids = list(scope_ids)
+        with self.lock:
+            self.counts.subtract(scope_ids)
+            released = [
+                scope_id
+                for scope_id in dict.fromkeys(scope_ids + list(watched))
+                if self.counts[scope_id] <= 0
+            ]
+            self._close(released)
+            return released
+
+    def count(self, scope_id: str) -> int:
+        with self.lock:
+            return self.counts[scope_id]
+
+    def stop(self, scope_id: str):
+        """Consider that all the tests of this scope have been executed."""
+        with self.lock:
+            self.counts[scope_id] = 0
+            self._close([scope_id])
+
+    def _close(self, scope_ids: Iterable[str]):
+        """Send the closed scopes to the resource managers which hold their resources.
+
+        The lock must be held."""
+        for scope_id in scope_ids:
+            for owner in self.owners.pop(scope_id, ()):
+                self.inboxes.setdefault(owner, []).append(scope_id)
+                self.message_ready.notify_all()
+
+    def acquire(self, scope_id: str, resource_id: str) -> bool:
+        """Return True if the caller is the first to ask for this resource in this scope,
+        and so must create it."""
+        with self.lock:
+            resources = self.resources.setdefault(scope_id, {})
+            if resource_id in resources:
+                return False
+            resources[resource_id] = None  # resource setup in progress
+            return True
+
+    def set_resource(
+        self,
+        scope_id: str,
+        resource_id: str,
+        resource: bytes,
+        output: str,
+        duration: float = 0.0,
+        owner: Optional[str] = None,
+    ):
+        """Share a pickled resource, the output of its setup and the duration of its setup.
+
+        owner: the resource manager which will tear down the resource when the scope is closed
+        """
+        with self.lock:
+            self.resources[scope_id][resource_id] = resource
+            self.outputs.setdefault(scope_id, {})[resource_id] = output
+            self.setup_durations[f"{resource_id} ({scope_id})"] = duration
+            self.resource_ready.notify_all()
+            if owner is not None:
+                self.owners.setdefault(scope_id, set()).add(owner)
+                if self.counts[scope_id] <= 0:
+                    self._close([scope_id])  # the scope is already closed
+
+    def resources_setup(self) -> dict[str, float]:
+        """The duration of the setup of each resource, by "resource_id (scope_id)"."""
+        with self.lock:
+            return dict(self.setup_durations)
+
+    def get_resource(
+        self, scope_id: str, resource_id: str
+    ) -> Optional[Tuple[bytes, str]]:
+        """Return the pickled resource and the output of its setup,
+        or None if the setup is in progress."""
+        with self.lock:
+            resource = self.resources[scope_id][resource_id]
+            if resource is None:
+                return None
+            return resource, self.outputs[scope_id][resource_id]
+
+    def wait_resource(
+        self, scope_id: str, resource_id: str, timeout: Optional[float] = None
+    ) -> Optional[Tuple[bytes, str]]:
+        """Wait until the resource is shared and return it with the output of its setup,
+        or None if the setup is still in progress after the timeout (in seconds)."""
+        with self.resource_ready:
+            self.resource_ready.wait_for(
+                lambda: self.resources[scope_id][resource_id] is not None, timeout
+            )
+            resource = self.resources[scope_id][resource_id]
+            if resource is None:
+                return None
+            return resource, self.outputs[scope_id][resource_id]
+
+    def lease(
+        self, scope_id: str, pool_id: str, size: int, timeout: Optional[float] = None
+    ) -> Optional[int]:
+        """Lease exclusively one of the size instances of a pool and return its index,
+        or None if all the instances are still leased after the timeout (in seconds).
+
+        An instance already created is preferred to a new one."""
+        with self.resource_ready:
+            pools = self.pools.setdefault(scope_id, {})
+            pools.setdefault(pool_id, (0, []))
+            self.resource_ready.wait_for(
+                lambda: bool(pools[pool_id][1]) or (pools[pool_id][0] < size), timeout
+            )
+            created, free = pools[pool_id]
+            if free:
+                return free.pop()
+            if created < size:
+                pools[pool_id] = (created + 1, free)
+                return created
+            return None
+
+    def give_back(self, scope_id: str, pool_id: str, index: int):
+        """The instance of the pool is not leased anymore."""
+        with self.lock:
+            self.pools[scope_id][pool_id][1].append(index)
+            self.resource_ready.notify_all()
+
+    def put_message(self, message: dict):
+        """Send a message to the first resource manager available."""
+        with self.lock:
+            self.messages.append(message)
+            self.message_ready.notify_all()
+
+    def next_message(
+        self, owner: str, timeout: Optional[float] = None
+    ) -> Optional[dict]:
+        """Wait for the next message of a resource manager, or None after the timeout (in seconds).
+
+        The scopes closed since its last message come first, as a single message
+        {"stop": False, "teardown": [scope_id, ...]}."""
+        with self.message_ready:
+            self.message_ready.wait_for(
+                lambda: bool(self.inboxes.get(owner)) or bool(self.messages), timeout
+            )
+            closed = self.inboxes.pop(owner, None)
+            if closed:
+                return {"stop": False, "teardown": closed}
+            if self.messages:
+                return self.messages.popleft()
+            return None
+
+    def released(self, scope_ids: Iterable[str]) -> list[str]:
+        """Return the scopes without remaining test among these scopes."""
+        with self.lock:
+            return [scope_id for scope_id in scope_ids if self.counts[scope_id] <= 0]
+
+
+class CoordinatorManager(SyncManager):
+    """A manager which also serves a ScopeCoordinator."""
+
+    ScopeCoordinator: Callable[[], ScopeCoordinator]
+
+
+CoordinatorManager.register("ScopeCoordinator", ScopeCoordinator)
@@ -1,6 +1,8 @@
 LYMBO_REPORT_PATH = "LYMBO_REPORT_PATH"
+LYMBO_REPORT_MODE = "LYMBO_REPORT_MODE"
 
 LYMBO_TEST_COLLECTION = "LYMBO_TEST_COLLECTION"
+LYMBO_MAX_PARAMS_PER_TEST = "LYMBO_MAX_PARAMS_PER_TEST"
 
 LYMBO_TEST_SCOPE_CLASS = "LYMBO_TEST_SCOPE_CLASS"
 LYMBO_TEST_SCOPE_FUNCTION = "LYMBO_TEST_SCOPE_FUNCTION"
@@ -9,6 +11,8 @@ LYMBO_TEST_SCOPE_GLOBAL = "LYMBO_TEST_SCOPE_GLOBAL"
 LYMBO_TEST_SCOPE_MAX = "LYMBO_TEST_SCOPE_MAX"
 
 LYMBO_RESOURCE_MANAGER = "LYMBO_RESOURCE_MANAGER"
+LYMBO_RESOURCE_TIMEOUT = "LYMBO_RESOURCE_TIMEOUT"
+LYMBO_SHARED_MEMORY_MIN_SIZE = "LYMBO_SHARED_MEMORY_MIN_SIZE"
 
 LYMBO_LOG_LEVEL = "LYMBO_LOG_LEVEL"
 LYMBO_LOG_PATH = "LYMBO_LOG_PATH"
@@ -8,3 +8,27 @@ class LymboExceptionFilter(Exception):
     """The test collection filter is broken."""
 
     pass
+
+
+class LymboExceptionNotLiteral(Exception):
+    """A test decorator can't be evaluated without executing its module."""
+
+    pass
+
+
+class LymboExceptionParameters(Exception):
+    """A test is expanded into too many parameters."""
+
+    pass
+
+
+class LymboExceptionResourceTimeout(Exception):
+    """The setup of a shared resource has not completed in time."""
+
+    pass
+
+
+class LymboExceptionResourceNotShareable(Exception):
+    """A shared resource can't be pickled to be sent to the workers."""
+
+    pass
@@ -0,0 +1,167 @@
+import fnmatch
+import functools
+import re
+from typing import Callable
+from typing import NamedTuple
+
+from lymbo.exception import LymboExceptionFilter
+
+KEYWORDS = ("and", "or", "not")
+
+
+class Token(NamedTuple):
+    kind: str  # "(", ")", "and", "or", "not" or "term"
+    value: str
+    position: int
+
+
+def tokenize(filter: str) -> list[Token]:
+    """Split a filter into parentheses, keywords and terms.
+
+    A term is a sequence of characters without space nor parenthesis,
+    or any text between double or single quotes.
+    """
+
+    tokens = []
+
+    pos = 0
+    while pos < len(filter):
+        char = filter[pos]
+        if char.isspace():
+            pos += 1
+        elif char in "()":
+            tokens.append(Token(char, char, pos))
+            pos += 1
+        elif char in "\"'":
+            end = filter.find(char, pos + 1)
+            if end == -1:
+                raise LymboExceptionFilter(
+                    f'The filter ["{filter}"] is broken. The quote at position {pos} is not closed.'
+                )
+            tokens.append(Token("term", filter[pos + 1 : end], pos))
+            pos = end + 1
+        else:
+            end = pos
+            while (
+                end < len(filter)
+                and not filter[end].isspace()
+                and filter[end] not in "()"
+            ):
+                end += 1
+            word = filter[pos:end]
+            tokens.append(Token(word if word in KEYWORDS else "term", word, pos))
+            pos = end
+
+    return tokens
+
+
+def compile_term(filter: str, token: Token) -> Callable[[str], bool]:
+    """Compile a term of the filter into a predicate.
+
+    - re:PATTERN: the regular expression is searched in the item
+    - a term with * or ?: the glob pattern is searched in the item
+    - otherwise, the term must be a substring of the item
+    """
+    term = token.value
+
+    if not term:
+        raise LymboExceptionFilter(
+            f'The filter ["{filter}"] is broken. The term at position {token.position} is empty.'
+        )
+
+    if term.startswith("re:"):
+        try:
+            regex = re.compile(term[3:])
+        except re.error as ex:
+            raise LymboExceptionFilter(
+                f'The filter ["{filter}"] is broken. The regular expression at position {token.position} is not valid: {ex}.'
+            )
+        return lambda item: regex.search(item) is not None
+
+    if ("*" in term) or ("?" in term):
+        glob = re.compile(fnmatch.translate(f"*{term}*"))
+        return lambda item: glob.match(item) is not None
+
+    return lambda item: term in item
+
+
+class FilterParser:
+    """A recursive descent parser for the filters:
+
+    expression := and_expression ("or" and_expression)*
+    and_expression := not_expression ("and" not_expression)*
+    not_expression := "not" not_expression | "(" expression ")" | term
+    """
+
+    def __init__(self, filter: str):
+        self.filter = filter
+        self.tokens = tokenize(filter)
+        self.pos = 0
+
+    def error(self, message: str) -> LymboExceptionFilter:
+        return LymboExceptionFilter(
+            f'The filter ["{self.filter}"] is broken. {message}'
+        )
+
+    def next(self, kind: str) -> bool:
+        if (self.pos < len(self.tokens)) and (self.tokens[self.pos].kind == kind):
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self) -> Callable[[str], bool]:
+        predicate = self.expression()
+        if self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            raise self.error(
+                f'Unexpected "{token.value}" at position {token.position}.'
+            )
+        return predicate
+
+    def expression(self) -> Callable[[str], bool]:
+        predicates = [self.and_expression()]
+        while self.next("or"):
+            predicates.append(self.and_expression())
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda item: any(predicate(item) for predicate in predicates)
+
+    def and_expression(self) -> Callable[[str], bool]:
+        predicates = [self.not_expression()]
+        while self.next("and"):
+            predicates.append(self.not_expression())
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda item: all(predicate(item) for predicate in predicates)
+
+    def not_expression(self) -> Callable[[str], bool]:
+        if self.pos >= len(self.tokens):
+            raise self.error("A term is missing at the end of the filter.")
+
+        token = self.tokens[self.pos]
+
+        if self.next("not"):
+            predicate = self.not_expression()
+            return lambda item: not predicate(item)
+
+        if self.next("("):
+            predicate = self.expression()
+            if not self.next(")"):
+                raise self.error(
+                    f"The parenthesis at position {token.position} is not closed."
+                )
+            return predicate
+
+        if self.next("term"):
+            return compile_term(self.filter, token)
+
+        raise self.error(f'Unexpected "{token.value}" at position {token.position}.')
+
+
+@functools.lru_cache(maxsize=32)
+def compile_filter(filter: str) -> Callable[[str], bool]:
+    """Parse a filter once and return a predicate to apply on the test names.
+
+    Example: "abc and not (def or re:ijk[0-9])"
+    """
+    return FilterParser(filter).parse()
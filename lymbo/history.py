@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+import math
+import os
+from pathlib import Path
+import sqlite3
+import time
+from typing import Iterable
+from typing import Optional
+
+from lymbo.item import TestPlan
+from lymbo.item import TestStatus
+
+HISTORY_SIZE = 20  # the number of runs kept for each test
+
+
+def percentile(durations: list[float], p: float) -> float:
+    """The nearest-rank percentile of a sorted list of durations."""
+    rank = max(math.ceil(p / 100 * len(durations)), 1)
+    return durations[rank - 1]
+
+
+@dataclass
+class TestDurations:
+    name: str
+    runs: int
+    p50: float  # seconds
+    p95: float  # seconds
+
+
+class TestHistory:
+    """The duration, the status and the worker of the tests of the last runs,
+    saved in a SQLite database and keyed by the uuid of the test."""
+
+    def __init__(self, path: Path):
+        os.makedirs(path, exist_ok=True)
+        self.path = Path(path) / "history.sqlite"
+        self.connection = sqlite3.connect(self.path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                " uuid TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " run_at REAL NOT NULL,"
+                " duration REAL NOT NULL,"
+                " status TEXT NOT NULL,"
+                " worker INTEGER NOT NULL"
+                ")"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS history_uuid ON history (uuid, run_at)"
+            )
+
+    def close(self):
+        self.connection.close()
+
+    def add(self, test_plan: TestPlan, run_at: Optional[float] = None):
+        """Save the duration of the executed tests of a run, and forget the oldest runs."""
+
+        run_at = run_at if run_at is not None else time.time()
+
+        rows = [
+            (
+                test.uuid,
+                str(test),
+                run_at,
+                test.duration,
+                test.status.value,
+                test.worker,
+            )
+            for tests in test_plan
+            for test in tests
+            if test.status in (TestStatus.PASSED, TestStatus.FAILED, TestStatus.BROKEN)
+        ]
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO history VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self.connection.execute(
+                "DELETE FROM history WHERE rowid IN ("
+                " SELECT rowid FROM ("
+                "  SELECT rowid, ROW_NUMBER() OVER (PARTITION BY uuid ORDER BY run_at DESC) AS run"
+                "  FROM history"
+                " ) WHERE run > ?"
+                ")",
+                (HISTORY_SIZE,),
+            )
+
+    def durations(
+        self, uuids: Optional[Iterable[str]] = None
+    ) -> dict[str, TestDurations]:
+        """The p50 and p95 durations of the tests (all the tests if uuids is None), by uuid."""
+
+        cursor = self.connection.execute(
+            "SELECT uuid, name, duration FROM history ORDER BY uuid, duration"
+        )
+
+        selected = set(uuids) if uuids is not None else None
+
+        by_uuid: dict[str, tuple[str, list[float]]] = {}
+        for uuid, name, duration in cursor:
+            if (selected is None) or (uuid in selected):
+                by_uuid.setdefault(uuid, (name, []))[1].append(duration)
+
+        return {
+            uuid: TestDurations(
+                name,
+                len(durations),
+                percentile(durations, 50),
+                percentile(durations, 95),
+            )
+            for uuid, (name, durations) in by_uuid.items()
+        }
+
+    def expected_durations(
+        self, uuids: Optional[Iterable[str]] = None
+    ) -> dict[str, float]:
+        """The expected (p50) duration of the tests, by uuid."""
+        return {
+            uuid: durations.p50 for uuid, durations in self.durations(uuids).items()
+        }
+
+    def slowest(
+        self, nb: int, uuids: Optional[Iterable[str]] = None
+    ) -> list[TestDurations]:
+        """The nb slowest tests, by p50 duration."""
+        return sorted(
+            self.durations(uuids).values(),
+            key=lambda durations: durations.p50,
+            reverse=True,
+        )[:nb]
@@ -0,0 +1,74 @@
+import hashlib
+import importlib
+import importlib.util
+from pathlib import Path
+import sys
+from types import ModuleType
+from unittest.mock import patch
+
+from lymbo.log import logger
+
+# the test modules already imported in this process, by absolute path
+_modules: dict[str, ModuleType] = {}
+
+
+def module_name_of(path: Path) -> str:
+    """The name of a test module, unique for its absolute path and identical in all the processes.
+
+    Two test files with the same name in different directories are imported as two modules.
+    """
+    path = Path(path).absolute()
+    digest = hashlib.sha1(str(path).encode()).hexdigest()[:12]
+    return f"lymbo_{digest}_{path.stem}"
+
+
+def import_test_module(path: Path) -> ModuleType:
+    """Import a test module, only once per process."""
+
+    path = Path(path).absolute()
+
+    module = _modules.get(str(path))
+
+    if module is None:
+
+        module_name = module_name_of(path)
+
+        logger().debug(f"import_test_module - {path} as {module_name}")
+
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        assert spec is not None and spec.loader is not None, f"{path} is not a module"
+        module = importlib.util.module_from_spec(spec)
+
+        # the module may import the other modules of its directory
+        syspath = sys.path + [
+            str(path.parent),
+        ]
+
+        sys.modules[module_name] = module
+        try:
+            with patch.object(sys, "path", syspath):
+                spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+
+        _modules[str(path)] = module
+
+    return module
+
+
+def import_module(module_name: str, path: Path) -> ModuleType:
+    """Import the module which defines an object used by a test (a context manager for example).
+
+    This is either a test module, or a module importable from the directory of its file.
+    """
+
+    if module_name == module_name_of(path):
+        return import_test_module(path)
+
+    syspath = sys.path + [
+        str(Path(path).parent.absolute()),
+    ]
+
+    with patch.object(sys, "path", syspath):
+        return importlib.import_module(module_name)
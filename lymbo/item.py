@@ -1,18 +1,20 @@
 from dataclasses import dataclass
 from enum import Enum
+import functools
 from functools import cached_property
 import hashlib
 import io
 import json
 import os
 from pathlib import Path
-import random
 import sys
 import time
 import traceback
 from typing import Any, List, Tuple
 from typing import Iterator
+from typing import NamedTuple
 from typing import Optional
+from typing import Sequence
 from typing import Union
 
 import lymbo
@@ -49,8 +51,85 @@ class GroupBy(Enum):
     FUNCTION = "function"
 
 
+class ResourceUsage(NamedTuple):
+    """A resource shared in a scope by a test: with scope_<scope>(cm, *args, **kwargs)."""
+
+    scope: str  # global, module, class or function
+    cm: str  # the name of the context manager in the test module
+    args: Optional[tuple]  # None if the arguments are not literals
+    kwargs: Optional[dict]
+
+    def __str__(self) -> str:
+        params = [self.cm]
+        if self.args is None or self.kwargs is None:
+            params.append("...")
+        else:
+            params += [repr(arg) for arg in self.args]
+            params += [f"{key}={value!r}" for key, value in self.kwargs.items()]
+        return f"scope_{self.scope}({', '.join(params)})"
+
+
+_paths: dict[Path, Path] = {}  # to share the same Path object between the tests
+
+
+def intern_path(path: Path) -> Path:
+    """Return a unique Path object for all the equal paths."""
+    return _paths.setdefault(path, path)
+
+
+@functools.lru_cache(maxsize=None)
+def canonical_path(path: Path) -> str:
+    """The absolute path of a file, the same however it is written on the command line."""
+    return str(path.resolve())
+
+
+@functools.lru_cache(maxsize=None)
+def scopes_of(path: Path, cls: Optional[str], fnc: str) -> dict:
+    """The scopes of a test, shared by all the tests of the same function."""
+    scopes = {
+        LYMBO_TEST_SCOPE_MODULE: f"{path}",
+        LYMBO_TEST_SCOPE_GLOBAL: LYMBO_TEST_SCOPE_GLOBAL,
+        LYMBO_TEST_SCOPE_MAX: "global",
+    }
+
+    if cls:
+        scopes[LYMBO_TEST_SCOPE_CLASS] = f"{path}::{cls}"
+        scopes[LYMBO_TEST_SCOPE_FUNCTION] = f"{path}::{cls}::{fnc}"
+    else:
+        scopes[LYMBO_TEST_SCOPE_FUNCTION] = f"{path}::{fnc}"
+        scopes[LYMBO_TEST_SCOPE_CLASS] = scopes[LYMBO_TEST_SCOPE_FUNCTION]
+
+    return scopes
+
+
+NO_EXPECTATION = ExpectedAssertion()
+
+
 class TestItem:
-    """A test"""
+    """A test
+
+    The output and the error details are allocated only when the test is executed.
+    """
+
+    __slots__ = (
+        "path",
+        "asynchronous",
+        "fnc",
+        "parameters",
+        "cls",
+        "expected",
+        "resources",
+        "_name",
+        "_uuid",
+        "start_at",
+        "end_at",
+        "worker",
+        "_output",
+        "status",
+        "reason",
+        "error_message",
+        "traceback",
+    )
 
     def __init__(
         self,
@@ -60,30 +139,58 @@ class TestItem:
         parameters: tuple[tuple[Any], dict[str, Any]],
         cls: Optional[str],
         expected: Optional[ExpectedAssertion],
+        resources: tuple[ResourceUsage, ...] = (),
     ):
-        self.path = path
+        self.path = intern_path(path)
         self.asynchronous = asynchronous
-        self.fnc = fnc
+        self.fnc = sys.intern(fnc)
         self.parameters = parameters
-        self.cls = cls
-        self.expected: ExpectedAssertion = expected if expected else ExpectedAssertion()
+        self.cls = sys.intern(cls) if cls else None
+        self.expected: ExpectedAssertion = expected if expected else NO_EXPECTATION
+        self.resources = resources  # shared by all the tests of the same function
 
-        md5 = hashlib.md5(str(self).encode()).hexdigest()
-        timestamp = int(time.time() * 1000000)
-        rnd = random.randint(0, 99999)
-        self.uuid = f"{md5}-{timestamp}-{rnd:05d}"
+        self._name: Optional[str] = None
+        self._uuid: Optional[str] = None
 
         self.start_at: float = 0.0
         self.end_at: float = 0.0
+        self.worker: int = 0  # the pid of the process which executed the test
 
-        self.output: io.StringIO = io.StringIO()
+        self._output: Optional[io.StringIO] = None
 
         self.status: TestStatus = TestStatus.PENDING
         self.reason: str = ""
-        self.error_message: List[str] = []
-        self.traceback: List[str] = []
+        self.error_message: Sequence[str] = ()
+        self.traceback: Sequence[str] = ()
+
+    @property
+    def output(self) -> io.StringIO:
+        if self._output is None:
+            self._output = io.StringIO()
+        return self._output
+
+    @output.setter
+    def output(self, output: io.StringIO):
+        self._output = output
+
+    @property
+    def uuid(self) -> str:
+        """A stable id, computed from the name of the test only, with the absolute path of its file."""
+        if self._uuid is None:
+            name = canonical_path(self.path) + str(self)[len(str(self.path)) :]
+            self._uuid = hashlib.sha1(name.encode()).hexdigest()
+        return self._uuid
+
+    @uuid.setter
+    def uuid(self, uuid: str):
+        self._uuid = uuid
 
-    def __str__(self):
+    def __str__(self) -> str:
+        if self._name is None:
+            self._name = self.__name()
+        return self._name
+
+    def __name(self) -> str:
 
         def print_variable(variable):
             if isinstance(variable, str):
@@ -133,7 +240,8 @@ class TestItem:
                 "status": self.status.value,
                 "start_at": self.start_at,
                 "end_at": self.end_at,
-                "output": self.output.getvalue(),
+                "worker": self.worker,
+                "output": self._output.getvalue() if self._output else "",
                 "error": {
                     "reason": self.reason,
                     "error_message": self.error_message,
@@ -144,6 +252,11 @@ class TestItem:
 
     def write_report(self):
 
+        if lymbo._results_queue is not None:
+            # the result is sent to the main process, which appends it to the report
+            lymbo._results_queue.put(self.to_json()["test"])
+            return
+
         path = f"{os.environ[LYMBO_REPORT_PATH]}/lymbo-{self.uuid}"
 
         with open(path + ".tmp", "w") as f:
@@ -158,20 +271,25 @@ class TestItem:
         if os.path.exists(path):
 
             with open(path) as f:
-                test_desc = json.load(f)["test"]
+                self.update_from_report(json.load(f)["test"])
 
-                assert test_desc["uuid"] == self.uuid
+    def update_from_report(self, test_desc: dict):
 
-                self.status = TestStatus(test_desc["status"])
-                self.start_at = test_desc["start_at"]
-                self.end_at = test_desc["end_at"]
-                self.output = io.StringIO(test_desc["output"])
-                self.reason = test_desc["error"]["reason"]
-                self.error_message = test_desc["error"]["error_message"]
-                self.traceback = test_desc["error"]["traceback"]
+        assert test_desc["uuid"] == self.uuid
+
+        self.status = TestStatus(test_desc["status"])
+        self.start_at = test_desc["start_at"]
+        self.end_at = test_desc["end_at"]
+        self.worker = test_desc.get("worker", 0)
+        self.output = io.StringIO(test_desc["output"])
+        self.reason = test_desc["error"]["reason"]
+        self.error_message = test_desc["error"]["error_message"]
+        self.traceback = test_desc["error"]["traceback"]
 
     def start(self):
         self.start_at = time.time()
+        self.worker = os.getpid()
+        self.status = TestStatus.INPROGRESS
         sys.stdout = self.output
         sys.stderr = self.output
         self.write_report()
@@ -199,22 +317,9 @@ class TestItem:
     def duration(self):
         return self.end_at - self.start_at
 
-    @cached_property
+    @property
     def scopes(self) -> dict:
-        scopes = {
-            LYMBO_TEST_SCOPE_MODULE: f"{self.path}",
-            LYMBO_TEST_SCOPE_GLOBAL: LYMBO_TEST_SCOPE_GLOBAL,
-            LYMBO_TEST_SCOPE_MAX: "global",
-        }
-
-        if self.cls:
-            scopes[LYMBO_TEST_SCOPE_CLASS] = f"{self.path}::{self.cls}"
-            scopes[LYMBO_TEST_SCOPE_FUNCTION] = f"{self.path}::{self.cls}::{self.fnc}"
-        else:
-            scopes[LYMBO_TEST_SCOPE_FUNCTION] = f"{self.path}::{self.fnc}"
-            scopes[LYMBO_TEST_SCOPE_CLASS] = scopes[LYMBO_TEST_SCOPE_FUNCTION]
-
-        return scopes
+        return scopes_of(self.path, self.cls, self.fnc)
 
     def __error_message(self, reason) -> List[str]:
 
@@ -301,9 +406,17 @@ class TestPlan:
         test_plan, _ = self.test_plan()
         return test_plan
 
+    def update_from_results(self, results: dict[str, dict]):
+        """Update the tests with their last result (by uuid)."""
+        for tests in self.groups:
+            for test in tests:
+                if test.uuid in results:
+                    test.update_from_report(results[test.uuid])
+
     def test_plan(
         self,
         show_status: bool = False,
+        show_resources: bool = False,
     ) -> Tuple[str, dict[TestStatus, int]]:
         output: list[str] = []
         tests_status = {status: 0 for status in TestStatus}
@@ -319,8 +432,9 @@ class TestPlan:
                 output.append(group_msg)
             for test in tests:
                 repr = f"{'  | -' if len(tests)>1 else '-'} {test}"
+                if show_resources and test.resources:
+                    repr += f" (resources: {', '.join(str(resource) for resource in test.resources)})"
                 if show_status:
-                    test.refresh_from_report()
                     tests_status[test.status] += 1
                     color_per_status = {
                         TestStatus.PENDING: color.RESET,
@@ -344,7 +458,6 @@ class TestPlan:
         nb = 0
         for tests in self.groups:
             for test in tests:
-                test.refresh_from_report()
                 if test.status in (TestStatus.BROKEN, TestStatus.FAILED):
                     nb += 1
                     padding = "  "
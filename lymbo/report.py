@@ -1,13 +1,28 @@
+from enum import Enum
 import glob
+import json
+import multiprocessing
 import os
 import tempfile
+import threading
+import traceback
 
+from lymbo.env import LYMBO_REPORT_MODE
 from lymbo.env import LYMBO_REPORT_PATH
+from lymbo.log import logger
+
+
+class ReportMode(Enum):
+    STREAM = "stream"  # all the results in a single JSON-lines file
+    FILES = "files"  # a JSON file per test
+
+
+RESULTS_FILENAME = "lymbo-results.jsonl"
 
 
 class TestReport:
 
-    def __init__(self, path=None):
+    def __init__(self, path=None, mode: ReportMode = ReportMode.STREAM):
         if path is None:
             path = tempfile.mkdtemp()
         else:
@@ -15,6 +30,7 @@ class TestReport:
         self.path = path
 
         os.environ[LYMBO_REPORT_PATH] = str(self.path)
+        os.environ[LYMBO_REPORT_MODE] = mode.value
 
         self.clean()
 
@@ -22,3 +38,65 @@ class TestReport:
 
         for lymbofile in glob.glob(os.path.join(self.path, "lymbo-*")):
             os.remove(lymbofile)
+
+
+def report_mode() -> ReportMode:
+    return ReportMode(os.environ.get(LYMBO_REPORT_MODE, ReportMode.STREAM.value))
+
+
+class TestResults(dict):
+    """The last result of each test, by uuid."""
+
+    def add(self, result: dict):
+        self[result["uuid"]] = result
+
+    @classmethod
+    def load(cls, path: str) -> "TestResults":
+        """Load all the results saved in a report directory at once."""
+
+        results = cls()
+
+        results_path = os.path.join(path, RESULTS_FILENAME)
+        if os.path.exists(results_path):
+            with open(results_path) as f:
+                for line in f:
+                    results.add(json.loads(line))
+
+        for report_path in glob.glob(os.path.join(path, "lymbo-*.json")):
+            with open(report_path) as f:
+                results.add(json.load(f)["test"])
+
+        return results
+
+
+class ResultsWriter(threading.Thread):
+    """Receive the results sent by the workers, append them to the results
+    file and keep them in memory.
+
+    The thread stops when it receives None.
+    """
+
+    def __init__(self, results_queue: multiprocessing.Queue):
+        super().__init__(daemon=True)
+        self.results_queue = results_queue
+        self.results = TestResults()
+        self.path = os.path.join(os.environ[LYMBO_REPORT_PATH], RESULTS_FILENAME)
+
+    def run(self):
+
+        with open(self.path, "a", buffering=1) as f:
+            while True:
+                try:
+                    result = self.results_queue.get()
+
+                    if result is None:
+                        break
+
+                    line = json.dumps(result)
+                    self.results.add(result)
+                    f.write(line + "\n")
+                except Exception as ex:
+                    # a broken result must not stop the reception of the next ones
+                    logger().error(
+                        f"ResultsWriter - can't save a result - exception=[{ex}], traceback={traceback.format_exc()}"
+                    )
@@ -1,61 +1,134 @@
+from collections import Counter
 import contextlib
+from enum import Enum
+import functools
 import importlib
 import inspect
 import io
-from multiprocessing.managers import DictProxy
-from multiprocessing.managers import SyncManager
 import os
 from pathlib import Path
 import pickle
-import queue
 import sys
 import time
 import traceback
 from typing import Any
-from typing import List
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
 from unittest.mock import patch
 
 import lymbo
+from lymbo.buffer import attach_buffer
+from lymbo.buffer import detach_buffer
+from lymbo.buffer import share_buffer
+from lymbo.buffer import SharedBuffer
+from lymbo.coordinator import CoordinatorManager
+from lymbo.coordinator import ScopeCoordinator
 from lymbo.env import LYMBO_RESOURCE_MANAGER
+from lymbo.env import LYMBO_RESOURCE_TIMEOUT
+from lymbo.env import LYMBO_SHARED_MEMORY_MIN_SIZE
 from lymbo.env import LYMBO_TEST_SCOPE_CLASS
 from lymbo.env import LYMBO_TEST_SCOPE_FUNCTION
 from lymbo.env import LYMBO_TEST_SCOPE_GLOBAL
 from lymbo.env import LYMBO_TEST_SCOPE_MAX
 from lymbo.env import LYMBO_TEST_SCOPE_MODULE
+from lymbo.exception import LymboExceptionResourceNotShareable
+from lymbo.exception import LymboExceptionResourceTimeout
 from lymbo.exception import LymboExceptionScopeHierarchy
+from lymbo.importer import import_module
+from lymbo.importer import import_test_module
 from lymbo.item import TestItem
 from lymbo.item import TestPlan
 from lymbo.log import logger
 
+DEFAULT_RESOURCE_TIMEOUT = 600.0  # seconds
+
+
+class LocalResources(Enum):
+    """The scopes whose resources are set up in the worker, when all the tests
+    of the scope are in the same group."""
+
+    NONE = "none"
+    FUNCTION = "function"
+    CLASS = "class"  # and function
+    MODULE = "module"  # and class and function
+
+    def scope_names(self) -> tuple[str, ...]:
+        return {
+            LocalResources.NONE: (),
+            LocalResources.FUNCTION: (LYMBO_TEST_SCOPE_FUNCTION,),
+            LocalResources.CLASS: (LYMBO_TEST_SCOPE_FUNCTION, LYMBO_TEST_SCOPE_CLASS),
+            LocalResources.MODULE: (
+                LYMBO_TEST_SCOPE_FUNCTION,
+                LYMBO_TEST_SCOPE_CLASS,
+                LYMBO_TEST_SCOPE_MODULE,
+            ),
+        }[self]
+
 
 @contextlib.contextmanager
 def _cm_by_scope(scope_name, cm, *args, **kwargs):
 
     unique_cm_id = f"{cm.__module__}.{cm.__name__}.{args}.{kwargs}"
 
-    scope = lymbo._shared_scopes[os.environ[scope_name]]
+    scope_id = os.environ[scope_name]
 
-    resource = None
-    is_new_resource = False
+    if scope_id in lymbo._local_scopes:
+        # all the tests of this scope are executed by this worker
+        yield _local_resource(scope_id, unique_cm_id, cm, args, kwargs)
+    else:
+        yield _shared_resource(scope_id, unique_cm_id, cm, args, kwargs)
 
-    with scope["lock"]:  # the lock is only to flag the resource creation
 
-        if unique_cm_id not in scope["resources"]:
+def _local_resource(scope_id, unique_cm_id, cm, args, kwargs):
+    """Return the resource of this scope, set up in this process by the first caller.
 
-            is_new_resource = True
+    The resource is neither pickled nor sent to a resource manager, so it can be
+    a socket, a connection or a file.
+    """
 
-            scope["resources"][unique_cm_id] = None  # resource setup in progress
-            scope["resources_output"][unique_cm_id] = ""
+    resources = lymbo._worker_resources.setdefault(scope_id, {})
 
-            module_name = cm.__module__
-            module = importlib.import_module(module_name)
-            module_path = inspect.getfile(module)
-            environ = os.environ.copy()
-            name = cm.__name__
-            resource_id = unique_cm_id
-            scope_id = os.environ.get(scope_name)
+    if unique_cm_id not in resources:
+        ctxmgr = cm(*args, **kwargs)
+        logger().debug(
+            f"_local_resource - instantiate a resource for {scope_id} -> resource=[{unique_cm_id}]"
+        )
+        try:
+            resources[unique_cm_id] = (ctxmgr, ctxmgr.__enter__())
+        except Exception as ex:
+            resources[unique_cm_id] = (None, ex)
+
+    _, resource = resources[unique_cm_id]
+
+    if isinstance(resource, Exception):
+        raise resource
 
-    if is_new_resource:
+    return resource
+
+
+def _shared_resource(scope_id, unique_cm_id, cm, args, kwargs):
+    """Return the resource shared in this scope, created by the first caller."""
+
+    cached = lymbo._resources_cache.get(scope_id, {}).get(unique_cm_id)
+
+    if cached:
+        # this worker has already unpickled the resource for a previous test
+        lymbo._resources_cache_hits += 1
+        return _use_resource(*cached)
+
+    coordinator = lymbo._coordinator
+
+    resource = None
+
+    if coordinator.acquire(scope_id, unique_cm_id):
+
+        module_name = cm.__module__
+        module = importlib.import_module(module_name)
+        module_path = inspect.getfile(module)
+        environ = os.environ.copy()
+        name = cm.__name__
+        resource_id = unique_cm_id
 
         if LYMBO_RESOURCE_MANAGER in os.environ:
             # it's a resource manager, create resource
@@ -69,13 +142,13 @@ def _cm_by_scope(scope_name, cm, *args, **kwargs):
                 kwargs,
                 lymbo._local_resources,
                 resource_id,
-                scope,
+                coordinator,
                 scope_id,
             )
 
         else:
             # it's a worker, sent message to create resource
-            lymbo._shared_queue.put(
+            coordinator.put_message(
                 {
                     "stop": False,
                     "scope_id": scope_id,
@@ -91,25 +164,50 @@ def _cm_by_scope(scope_name, cm, *args, **kwargs):
                 }
             )
 
-    while (
-        scope["resources"][unique_cm_id] is None
-    ):  # wait until the resource is created
-        time.sleep(0.1)  # TODO infinite loop risk
+    # wait until the resource is created
+    timeout = float(os.environ.get(LYMBO_RESOURCE_TIMEOUT, DEFAULT_RESOURCE_TIMEOUT))
+    shared_resource = coordinator.wait_resource(scope_id, unique_cm_id, timeout)
 
-    if scope["resources_output"][unique_cm_id]:
-        print(
-            scope["resources_output"][unique_cm_id]
-        )  # by printing the output here, it will be added to the test output
+    if shared_resource is None:
+        raise LymboExceptionResourceTimeout(
+            f"The setup of the resource [{unique_cm_id}] for the scope [{scope_id}] has not completed in {timeout} seconds."
+        )
+
+    pickled_resource, resource_output = shared_resource
 
     if (
         resource is None
     ):  # no need to unpickle the resource if created in this process just now
-        resource = pickle.loads(scope["resources"][unique_cm_id])
+        resource = pickle.loads(pickled_resource)
+
+        if (LYMBO_RESOURCE_MANAGER not in os.environ) and not isinstance(
+            resource, Exception
+        ):
+            # the resource is the same until the teardown of the scope
+            lymbo._resources_cache_misses += 1
+            lymbo._resources_cache.setdefault(scope_id, {})[unique_cm_id] = (
+                resource,
+                resource_output,
+            )
+
+    return _use_resource(resource, resource_output)
+
+
+def _use_resource(resource, resource_output):
+
+    if resource_output:
+        print(
+            resource_output
+        )  # by printing the output here, it will be added to the test output
+
+    if isinstance(resource, SharedBuffer):
+        # the resource is mapped from the shared memory, not copied
+        resource = attach_buffer(resource)
 
     if isinstance(resource, Exception):
         raise resource  # TODO report the original traceback
 
-    yield resource
+    return resource
 
 
 @contextlib.contextmanager
@@ -163,53 +261,151 @@ def scope_function(cm, *args, **kwargs):
             yield resource
 
 
-def new_scope(manager: SyncManager) -> DictProxy:
-    """Define a scope and its resources in a variable shared among all processes."""
-    scope = manager.dict()
-    scope["count"] = 0  # number of possible occurrence for this scope
-    scope["lock"] = manager.Lock()  # to update the "count" value
-    scope["resources"] = manager.dict()  # all the resources created for this scope
-    scope["resources_output"] = (
-        manager.dict()
-    )  # all the resources output created for this scope
-    return scope
+@contextlib.contextmanager
+def scope_pool(cm, *args, pool_size=1, **kwargs):
+    """Lease exclusively one of the pool_size instances of a resource for the duration of the block.
 
+    The instances are created when needed and kept alive in the global scope, so
+    up to pool_size tests use their own instance at the same time without paying its setup.
+    The other arguments are given to the context manager.
+    """
 
-def prepare_scopes(test_plan: TestPlan, manager: SyncManager) -> DictProxy:
-    """Prepare a list of all possible scopes and store them in a variable shared among all processes."""
+    if pool_size < 1:
+        raise ValueError(f"The size of a pool must be at least 1, not [{pool_size}].")
 
-    scopes = manager.dict()
+    if os.environ[LYMBO_TEST_SCOPE_MAX] in ("module", "class", "function"):
+        raise LymboExceptionScopeHierarchy(
+            f"You can't share a resource with the scope [pool] under a shared resource with the scope [{os.environ[LYMBO_TEST_SCOPE_MAX]}]"
+        )
 
-    # The scopes are retrieved from the test plan.
+    pool_id = f"{cm.__module__}.{cm.__name__}.{args}.{kwargs}"
 
-    for tests in test_plan:
-        for test in tests:
-            for scope_category, scope in test.scopes.items():
+    coordinator = lymbo._coordinator
+
+    scope_id = os.environ[LYMBO_TEST_SCOPE_GLOBAL]
+
+    timeout = float(os.environ.get(LYMBO_RESOURCE_TIMEOUT, DEFAULT_RESOURCE_TIMEOUT))
+    index = coordinator.lease(scope_id, pool_id, pool_size, timeout)
+
+    if index is None:
+        raise LymboExceptionResourceTimeout(
+            f"No instance of the pool [{pool_id}] (pool_size={pool_size}) has been given back in {timeout} seconds."
+        )
+
+    try:
+        with patch.dict(os.environ, {LYMBO_TEST_SCOPE_MAX: "global"}):
+            yield _shared_resource(scope_id, f"{pool_id}#{index}", cm, args, kwargs)
+    finally:
+        coordinator.give_back(scope_id, pool_id, index)
+
+
+def prepare_scopes(
+    test_plan: TestPlan, manager: CoordinatorManager
+) -> ScopeCoordinator:
+    """Prepare a coordinator which counts the tests of all possible scopes, shared among all processes."""
+
+    # The scopes are retrieved from the test plan, then sent at once to the coordinator.
 
-                if scope not in scopes:
-                    scopes[scope] = new_scope(manager)
+    coordinator = manager.ScopeCoordinator()
+    coordinator.add_tests(count_scopes(test_plan))
 
-                scopes[scope]["count"] += 1
+    return coordinator
 
-    return scopes
 
+def count_scopes(
+    test_plan: Iterable[list[TestItem]], scope_names: Optional[Iterable[str]] = None
+) -> Counter[str]:
+    """Count the tests of each scope (only the scopes of these kinds if scope_names is set)."""
 
-def manage_resources(scopes, shared_queue: queue.Queue):
+    counts: Counter[str] = Counter()
+
+    for tests in test_plan:
+        for test in tests:
+            if scope_names is None:
+                counts.update(test.scopes.values())
+            else:
+                counts.update(test.scopes[scope_name] for scope_name in scope_names)
+
+    return counts
+
+
+def local_scopes(
+    tests: list[TestItem], counts: Mapping[str, int], scope_names: Iterable[str]
+) -> set[str]:
+    """The scopes whose tests are all in this group.
+
+    counts: the number of tests of each scope of these kinds in the test plan (see count_scopes)
+    """
+    group_counts = count_scopes([tests], scope_names)
+    return {
+        scope_id
+        for scope_id, count in group_counts.items()
+        if counts.get(scope_id) == count
+    }
+
+
+def teardown_local_resources(scope_ids: Iterable[str]):
+    """Exit the context managers of the resources set up in this process for these scopes."""
+
+    for scope_id in scope_ids:
+        resources = lymbo._worker_resources.pop(scope_id, {})
+        for ctxmgr, _ in reversed(resources.values()):
+            if ctxmgr is None:
+                continue  # the setup has failed
+            try:
+                logger().debug(
+                    f"teardown_local_resources - teardown resource for {scope_id} -> resource=[{ctxmgr}]"
+                )
+                with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                    with contextlib.redirect_stderr(stdout):
+                        ctxmgr.__exit__(None, None, None)
+                if stdout.getvalue():
+                    logger().debug(
+                        f"teardown_local_resources - output: {stdout.getvalue()}"
+                    )
+            except Exception as ex:
+                logger().debug(
+                    f"teardown_local_resources - exception during the teardown of {ctxmgr} for {scope_id} - exception=[{ex}]"
+                )
+
+
+def manage_resources(coordinator: ScopeCoordinator) -> tuple[int, float]:
 
     # this is a resource manager
     os.environ[LYMBO_RESOURCE_MANAGER] = "1"
-    lymbo._shared_queue = shared_queue
-    lymbo._shared_scopes = scopes
+    lymbo._coordinator = coordinator
 
     lymbo._local_resources = {}
 
-    while scopes[LYMBO_TEST_SCOPE_GLOBAL]["count"] > 0:
+    while True:
 
-        message = shared_queue.get()
+        message = coordinator.next_message(str(os.getpid()))
+        assert message is not None  # no timeout
 
         if message["stop"]:
             break  # all the tests have been executed
 
+        if "teardown" in message:
+            # the coordinator sends the closed scopes whose resources are held by this process
+            teardown_resources(lymbo._local_resources, message["teardown"])
+            continue
+
+        if "prewarm" in message:
+            try:
+                prewarm_resource(
+                    coordinator,
+                    lymbo._local_resources,
+                    message["scope_id"],
+                    **message["prewarm"],
+                )
+            except Exception as ex:
+                # the resource will be set up when a test asks for it
+                logger().debug(
+                    f"manage_resources - exception during the prewarm of a resource for {message['scope_id']} -> "
+                    f"prewarm=[{message['prewarm']}] Exception=[{ex}]"
+                )
+            continue
+
         # setup resource
         try:
             module_name = message["resource"]["module_name"]
@@ -220,7 +416,6 @@ def manage_resources(scopes, shared_queue: queue.Queue):
             environ = message["resource"]["environ"]
             resource_id = message["resource"]["id"]
             scope_id = message["scope_id"]
-            scope = scopes[scope_id]
 
             setup_resource(
                 module_name,
@@ -231,7 +426,7 @@ def manage_resources(scopes, shared_queue: queue.Queue):
                 kwargs,
                 lymbo._local_resources,
                 resource_id,
-                scope,
+                coordinator,
                 scope_id,
             )
 
@@ -241,23 +436,22 @@ def manage_resources(scopes, shared_queue: queue.Queue):
                 f"resource=[{module_name}.{name}({args}{kwargs}] Exception=[{ex}]"
             )
 
-        # free resources
-        teardown_resources(scopes, lymbo._local_resources)
-
     # free resources
-    teardown_resources(scopes, lymbo._local_resources)
+    teardown_resources(lymbo._local_resources, list(lymbo._local_resources))
+
+    return os.getpid(), lymbo._worker_startup
 
 
 def setup_resource(
     module_name: str,
     module_path: str,
-    environ: List[str],
+    environ: dict[str, str],
     name: str,
     args,
     kwargs,
     resources: dict,
     resource_id: str,
-    scope: DictProxy,
+    coordinator: ScopeCoordinator,
     scope_id: str,
 ) -> Any:
 
@@ -277,76 +471,213 @@ def setup_resource(
         sys.stdout = stdout
         sys.stderr = stdout
 
-        module = importlib.import_module(module_name)
+        cm = None
 
-        ctxmgr = getattr(module, name)
-
-        cm = ctxmgr(*args, **kwargs)
+        tstart = time.perf_counter()
 
         try:
             logger().debug(
                 f"manage_resources - instantiate a resource for {scope_id} -> "
                 f"resource=[{module_name}.{name}({args}{kwargs})]"
             )
+            module = import_module(module_name, Path(module_path))
+            ctxmgr = getattr(module, name)
+            cm = ctxmgr(*args, **kwargs)
             resource = cm.__enter__()
             logger().debug(
                 f"manage_resources - instantiate a resource for {scope_id} -> "
                 f"resource=[{module_name}.{name}({args}{kwargs}] done"
             )
         except Exception as ex:
+            # the tests waiting for this resource will raise this exception
             resource = ex
+            cm = None  # not entered, so nothing to tear down
+        finally:
+            sys.stdout = original_stdout
+            sys.stderr = original_stderr
 
-        scope["resources"][resource_id] = pickle.dumps(resource)
+        # we save the context manager to execute the teardown method when the scope count =0
+        resources[scope_id] = resources.get(scope_id, [])
+        if cm is not None:
+            resources[scope_id].append(cm)
 
-        sys.stdout = original_stdout
-        sys.stderr = original_stderr
+        min_size = os.environ.get(LYMBO_SHARED_MEMORY_MIN_SIZE)
 
-        scope["resources_output"][resource_id] = stdout.getvalue()
+        try:
+            shared_buffer = share_buffer(resource, int(min_size)) if min_size else None
+            if shared_buffer:
+                pickled_resource = pickle.dumps(shared_buffer[0])
+                # the shared memory is freed with the resource
+                resources[scope_id].append(shared_buffer[1])
+            else:
+                pickled_resource = pickle.dumps(resource)
+        except Exception as ex:
+            # the tests receive the reason why the resource can't be shared
+            pickled_resource = pickle.dumps(
+                LymboExceptionResourceNotShareable(
+                    f"The resource [{module_name}.{name}({args}{kwargs})] can't be pickled"
+                    f" to be shared in the scope [{scope_id}]: {ex}"
+                )
+            )
 
-        # we save the context manager to execute the teardown method when the scope count =0
-        resources[scope_id] = resources.get(scope_id, [])
-        resources[scope_id].append(cm)
+        coordinator.set_resource(
+            scope_id,
+            resource_id,
+            pickled_resource,
+            stdout.getvalue(),
+            time.perf_counter() - tstart,
+            str(os.getpid()),  # this resource manager will tear it down
+        )
 
         return resource
 
 
-def teardown_resources(scopes, resources):
+def prewarm_messages(
+    test_plan: TestPlan,
+    exclude: Iterable[str] = (),
+    scopes: Iterable[str] = ("global", "module"),
+) -> list[dict]:
+    """The messages to set up the resources shared in these scopes (global and module),
+    known from the collection, before the tests ask for them.
+
+    exclude: the scopes whose resources are set up in the workers
+    """
+
+    exclude = set(exclude)
+    scopes = tuple(scopes)
+
+    messages = {}
+
+    for tests in test_plan:
+        for test in tests:
+            for resource in test.resources:
+                if (resource.scope not in scopes) or (resource.args is None):
+                    continue  # the arguments are known only at runtime
+                scope_name = (
+                    LYMBO_TEST_SCOPE_GLOBAL
+                    if resource.scope == "global"
+                    else LYMBO_TEST_SCOPE_MODULE
+                )
+                scope_id = test.scopes[scope_name]
+                if scope_id in exclude:
+                    continue
+                key = (scope_id, str(test.path), resource.cm, str(resource))
+                if key not in messages:
+                    messages[key] = {
+                        "stop": False,
+                        "scope_id": scope_id,
+                        "prewarm": {
+                            "path": str(test.path),
+                            "cm": resource.cm,
+                            "args": resource.args,
+                            "kwargs": resource.kwargs,
+                            "environ": {
+                                **test.scopes,
+                                LYMBO_TEST_SCOPE_MAX: resource.scope,
+                            },
+                        },
+                    }
+
+    return list(messages.values())
+
+
+def prewarm_resource(
+    coordinator: ScopeCoordinator,
+    resources: dict,
+    scope_id: str,
+    path: str,
+    cm: str,
+    args: tuple,
+    kwargs: dict,
+    environ: dict,
+):
+    """Set up a resource in a resource manager, unless a test has already asked for it."""
+
+    try:
+        module = import_test_module(Path(path))
+
+        ctxmgr = functools.reduce(getattr, cm.split("."), module)
+
+        # the same id as in _cm_by_scope
+        resource_id = f"{ctxmgr.__module__}.{ctxmgr.__name__}.{args}.{kwargs}"
+
+        module_name = ctxmgr.__module__
+        module_path = inspect.getfile(sys.modules[module_name])
 
-    released_scopes = []
+    except Exception as ex:
+        # the resource will be set up when a test asks for it
+        logger().debug(
+            f"prewarm_resource - can't set up {cm}{args}{kwargs} for {scope_id} from {path} - exception=[{ex}]"
+        )
+        return
+
+    if coordinator.acquire(scope_id, resource_id):
+        try:
+            setup_resource(
+                module_name,
+                module_path,
+                {**os.environ, **environ},
+                ctxmgr.__name__,
+                args,
+                kwargs,
+                resources,
+                resource_id,
+                coordinator,
+                scope_id,
+            )
+        except Exception as ex:
+            # the tests can't set up the resource anymore, they raise this exception
+            logger().debug(
+                f"prewarm_resource - exception during the setup of {cm}{args}{kwargs} for {scope_id} - exception=[{ex}]"
+            )
+            try:
+                pickled_exception = pickle.dumps(ex)
+            except Exception as pickling_ex:
+                pickled_exception = pickle.dumps(
+                    LymboExceptionResourceNotShareable(
+                        f"The exception raised by the setup of [{cm}({args}{kwargs})] can't be pickled"
+                        f" to be shared in the scope [{scope_id}]: {ex!r} ({pickling_ex})"
+                    )
+                )
+            coordinator.set_resource(scope_id, resource_id, pickled_exception, "")
+
+
+def teardown_resources(resources: dict, released_scopes: Iterable[str]):
+    """Exit the context managers of the resources of these scopes, held by this process."""
+
+    released_scopes = [
+        scope_id for scope_id in released_scopes if scope_id in resources
+    ]
 
     try:
 
-        for scope_id, resources_by_scope in resources.items():
-            if scopes[scope_id]["count"] == 0:
-                for resource in resources_by_scope:
-                    try:
-                        logger().debug(
-                            f"teardown_resources - teardown resource for {scope_id} -> resource=[{resource}]"
-                        )
-                        original_stdout = sys.stdout
-                        original_stderr = sys.stderr
-
-                        stdout = io.StringIO()
-                        sys.stdout = stdout
-                        sys.stderr = stdout
-
-                        resource.__exit__(
-                            None, None, None
-                        )  # TODO pass exception if necessary
-
-                        sys.stdout = original_stdout
-                        sys.stderr = original_stderr
-                    except Exception as ex:
-                        sys.stdout = original_stdout
-                        sys.stderr = original_stderr
-
-                        logger().warning(
-                            "An exception occurred during the execution of the resource's teardown."
-                            f" stdout=[{stdout.getvalue()}], exception=[{ex}], traceback={traceback.format_exc()}"
-                        )
-                released_scopes.append(scope_id)
-
-        released_scopes = set(released_scopes)
+        for scope_id in released_scopes:
+            for resource in resources[scope_id]:
+                try:
+                    logger().debug(
+                        f"teardown_resources - teardown resource for {scope_id} -> resource=[{resource}]"
+                    )
+                    original_stdout = sys.stdout
+                    original_stderr = sys.stderr
+
+                    stdout = io.StringIO()
+                    sys.stdout = stdout
+                    sys.stderr = stdout
+
+                    resource.__exit__(
+                        None, None, None
+                    )  # TODO pass exception if necessary
+
+                    sys.stdout = original_stdout
+                    sys.stderr = original_stderr
+                except Exception as ex:
+                    sys.stdout = original_stdout
+                    sys.stderr = original_stderr
+
+                    logger().warning(
+                        "An exception occurred during the execution of the resource's teardown."
+                        f" stdout=[{stdout.getvalue()}], exception=[{ex}], traceback={traceback.format_exc()}"
+                    )
 
         for scope_id in released_scopes:
             del resources[scope_id]
@@ -356,9 +687,20 @@ def teardown_resources(scopes, resources):
         )
 
 
-def unset_scope(scopes, test_item: TestItem):
+def unset_scope(coordinator: ScopeCoordinator, test_item: TestItem):
+
+    # the scopes of the resources unpickled by this worker may have been closed by another worker
+    released_scopes = coordinator.finish_test(
+        list(test_item.scopes.values()), list(lymbo._resources_cache)
+    )
+
+    # the resources of these scopes will be torn down
+    evict_resources(released_scopes)
+
 
-    for scope_id in test_item.scopes.values():
-        scope = scopes[scope_id]
-        with scope["lock"]:
-            scope["count"] -= 1
+def evict_resources(scope_ids: Iterable[str]):
+    """Forget the resources of these scopes unpickled by this worker."""
+    for scope_id in scope_ids:
+        for resource, _ in lymbo._resources_cache.pop(scope_id, {}).values():
+            if isinstance(resource, SharedBuffer):
+                detach_buffer(resource.name)
@@ -1,47 +1,124 @@
 import asyncio
 import concurrent.futures
+from dataclasses import dataclass
+from dataclasses import field
 import functools
-import queue
 import multiprocessing
-from multiprocessing.managers import DictProxy
+from multiprocessing import resource_tracker
 import os
 import sys
 import time
 import traceback
+from typing import Mapping
 from typing import Optional
 from unittest.mock import patch
 
 import lymbo
 from lymbo import color
+from lymbo.coordinator import CoordinatorManager
+from lymbo.coordinator import ScopeCoordinator
+from lymbo.env import LYMBO_REPORT_PATH
 from lymbo.env import LYMBO_TEST_SCOPE_GLOBAL
+from lymbo.importer import import_test_module
 from lymbo.item import TestItem
 from lymbo.item import TestPlan
 from lymbo.log import logger
 from lymbo.log import trace_call
+from lymbo.report import report_mode
+from lymbo.report import ReportMode
+from lymbo.report import ResultsWriter
+from lymbo.report import TestResults
+from lymbo.resource_manager import count_scopes
+from lymbo.resource_manager import evict_resources
+from lymbo.resource_manager import local_scopes
+from lymbo.resource_manager import LocalResources
 from lymbo.resource_manager import manage_resources
 from lymbo.resource_manager import prepare_scopes
+from lymbo.resource_manager import prewarm_messages
+from lymbo.resource_manager import teardown_local_resources
 from lymbo.resource_manager import unset_scope
+from lymbo.scheduler import schedule
+from lymbo.scheduler import ScheduleMode
+from lymbo.scheduler import submit_groups
+from lymbo.scheduler import tail_latency
+
+
+@dataclass
+class RunSummary:
+    duration: int = 0  # seconds
+    prepare_scopes: float = 0.0  # seconds
+    # the mean time to start a worker process (seconds)
+    workers_startup: float = 0.0
+    # the time between the first worker going idle and the end of the run (seconds)
+    tail_latency: float = 0.0
+    # the duration of the setup of each shared resource, by "resource_id (scope_id)" (seconds)
+    resources_setup: dict[str, float] = field(default_factory=dict)
 
 
 @trace_call
-def run_test_plan(test_plan: TestPlan, max_workers: Optional[int] = None) -> int:
+def run_test_plan(
+    test_plan: TestPlan,
+    max_workers: Optional[int] = None,
+    durations: Optional[Mapping[str, float]] = None,
+    schedule_mode: ScheduleMode = ScheduleMode.DURATION,
+    max_live_resources: Optional[int] = None,
+    prewarm: bool = False,
+    local_resources: LocalResources = LocalResources.FUNCTION,
+) -> RunSummary:
+    """Run the tests of the test plan, the longest groups first.
+
+    durations: the expected duration of the tests, by uuid
+    schedule_mode: the order of the groups (see schedule)
+    max_live_resources: the maximum number of resources shared in the global, module and class scopes
+                        alive at once (the groups are scheduled by scope)
+    prewarm: start the setup of the resources shared in the global and the module scopes before the tests
+             (only the global scope with max_live_resources)
+    local_resources: the scopes whose resources are set up in the worker when all their tests are in the same group
+    """
 
-    # TODO add a try first to execute long test first
     # TODO shuffle the tests
 
+    summary = RunSummary()
+
+    if max_live_resources and (schedule_mode != ScheduleMode.SCOPE):
+        # the resources of a scope are released only when all its groups are finished
+        logger().info(
+            f"run_test_plan - the groups are scheduled by scope with max_live_resources={max_live_resources}"
+        )
+        schedule_mode = ScheduleMode.SCOPE
+
     tstart = time.time()
 
-    with multiprocessing.Manager() as manager:
+    results_queue: Optional[multiprocessing.Queue] = None
+
+    if report_mode() == ReportMode.STREAM:
+        # the workers send the results to this process, which writes the report
+        results_queue = multiprocessing.Queue()
+        results_writer = ResultsWriter(results_queue)
+        results_writer.start()
 
-        shared_queue: queue.Queue = manager.Queue()
+    # the processes inherit a single resource tracker, whatever the start method,
+    # which keeps one registration of each shared memory block
+    resource_tracker.ensure_running()
 
-        scopes = prepare_scopes(test_plan, manager)
+    with CoordinatorManager() as manager:
 
-        run_tests_with_scopes_and_shared_queue = functools.partial(
-            run_tests, scopes=scopes, shared_queue=shared_queue
+        tprepare = time.perf_counter()
+        coordinator = prepare_scopes(test_plan, manager)
+        summary.prepare_scopes = time.perf_counter() - tprepare
+        logger().debug(
+            f"run_test_plan - scopes prepared in {summary.prepare_scopes:.3f}s"
         )
-        manage_resources_with_scopes_and_shared_queue = functools.partial(
-            manage_resources, scopes=scopes, shared_queue=shared_queue
+
+        # the workers set up the resources of a scope whose tests are all in their group
+        local_scope_names = local_resources.scope_names()
+        local_scope_counts = count_scopes(test_plan, local_scope_names)
+
+        run_tests_with_coordinator = functools.partial(
+            run_tests, coordinator=coordinator
+        )
+        manage_resources_with_coordinator = functools.partial(
+            manage_resources, coordinator=coordinator
         )
 
         if max_workers is None:
@@ -51,32 +128,83 @@ def run_test_plan(test_plan: TestPlan, max_workers: Optional[int] = None) -> int
 
         logger().debug(f"run_test_plan - max_workers={max_workers}")
 
+        # the startup time of each worker process, by pid
+        workers_startup: dict[int, float] = {}
+
         with concurrent.futures.ProcessPoolExecutor(
-            max_workers=max_workers
+            max_workers=max_workers,
+            initializer=init_worker,
+            initargs=(None, time.time()),
         ) as resources_manager:
 
             # # Start the resources manager processes
             resources_manager_futures = [
-                resources_manager.submit(manage_resources_with_scopes_and_shared_queue)
+                resources_manager.submit(manage_resources_with_coordinator)
                 for _ in range(max_workers)
             ]
 
+            if prewarm:
+                # the resource managers start the setup before the tests ask for the resources
+                colocated = set().union(
+                    *(
+                        local_scopes(tests, local_scope_counts, local_scope_names)
+                        for tests in test_plan
+                    )
+                )
+                # with a maximum number of resources alive, the resources of a module
+                # are set up only when its tests start
+                scopes = ("global",) if max_live_resources else ("global", "module")
+                for message in prewarm_messages(
+                    test_plan, exclude=colocated, scopes=scopes
+                ):
+                    coordinator.put_message(message)
+
             with concurrent.futures.ProcessPoolExecutor(
-                max_workers=max_workers
+                max_workers=max_workers,
+                initializer=init_worker,
+                initargs=(
+                    results_queue,
+                    time.time(),
+                    local_scope_names,
+                    dict(local_scope_counts),
+                ),
             ) as tests_executor:
-                execresult = tests_executor.map(
-                    run_tests_with_scopes_and_shared_queue, test_plan
+                # the idle workers pull the next group from the queue of the executor
+                execresult = submit_groups(
+                    tests_executor,
+                    run_tests_with_coordinator,
+                    schedule(test_plan, durations, schedule_mode),
+                    max_live_resources,
                 )
 
-            for worker_result in execresult:
+            if results_queue:
+                results_queue.put(None)
+                results_writer.join()
+                results = results_writer.results
+            else:
+                results = TestResults.load(os.environ[LYMBO_REPORT_PATH])
+
+            # the results are read once, the summary and the failures are displayed from the test plan
+            test_plan.update_from_results(results)
+
+            # the time when each worker has finished its last group, by pid
+            workers_end: dict[int, float] = {}
+
+            for worker_future in execresult:
+                worker_result = worker_future.result()
                 logger().debug(f"run_test_plan - worker result: [{worker_result}]")
+                pid, startup, end_at = worker_result
+                workers_startup[pid] = startup
+                workers_end[pid] = max(end_at, workers_end.get(pid, 0.0))
+
+            summary.tail_latency = tail_latency(workers_end)
+            summary.resources_setup = coordinator.resources_setup()
 
             # should already be 0 but we force this value because this is what stop the resources manager processes
-            with scopes[LYMBO_TEST_SCOPE_GLOBAL]["lock"]:
-                scopes[LYMBO_TEST_SCOPE_GLOBAL]["count"] = 0
+            coordinator.stop(LYMBO_TEST_SCOPE_GLOBAL)
 
             for _ in range(max_workers if max_workers else 4):
-                shared_queue.put_nowait({"stop": True})
+                coordinator.put_message({"stop": True})
 
             # Wait for a maximum of 30 seconds for all resource managers to complete
             try:
@@ -88,6 +216,8 @@ def run_test_plan(test_plan: TestPlan, max_workers: Optional[int] = None) -> int
                         logger().debug(
                             f"run_test_plan - resource manager result: [{resource_manager_result}]"
                         )
+                        pid, startup = resource_manager_result
+                        workers_startup[pid] = startup
                     except concurrent.futures.TimeoutError:
                         logger().debug(
                             "run_test_plan - A resource manager process timed out while waiting for completion."
@@ -103,20 +233,53 @@ def run_test_plan(test_plan: TestPlan, max_workers: Optional[int] = None) -> int
 
         # TODO ensure all the processes have been stopped and the resources released.
 
-    duration = int(time.time() - tstart)
+        if workers_startup:
+            summary.workers_startup = sum(workers_startup.values()) / len(
+                workers_startup
+            )
+
+    summary.duration = int(time.time() - tstart)
 
-    return duration
+    return summary
 
 
-def run_tests(tests: list[TestItem], scopes: DictProxy, shared_queue: queue.Queue):
+def init_worker(
+    results_queue: Optional[multiprocessing.Queue],
+    started_at: float,
+    local_scope_names: tuple[str, ...] = (),
+    local_scope_counts: Optional[dict[str, int]] = None,
+):
+
+    lymbo._results_queue = results_queue
+    lymbo._worker_startup = time.time() - started_at
+    lymbo._local_scope_names = local_scope_names
+    lymbo._local_scope_counts = local_scope_counts if local_scope_counts else {}
+
+
+def run_tests(
+    tests: list[TestItem], coordinator: ScopeCoordinator
+) -> tuple[int, float, float]:
     """Run a group of tests sequentially."""
 
     # this is a worker
-    lymbo._shared_queue = shared_queue
-    lymbo._shared_scopes = scopes
+    lymbo._coordinator = coordinator
+
+    # the resources of these scopes are set up in this process
+    lymbo._local_scopes = local_scopes(
+        tests, lymbo._local_scope_counts, lymbo._local_scope_names
+    )
+    remaining = count_scopes([tests], lymbo._local_scope_names)
 
     try:
 
+        # pre-warm: the modules of the group are imported before the first test starts
+        for path in dict.fromkeys(test_item.path for test_item in tests):
+            try:
+                import_test_module(path)
+            except Exception as ex:
+                # the error will be reported by the tests of this module
+                logger().debug(f"run_tests - can't import {path} - exception=[{ex}]")
+
         for test_item in tests:
 
             try:
@@ -127,11 +290,30 @@ def run_tests(tests: list[TestItem], scopes: DictProxy, shared_queue: queue.Queu
                     run_test(test_item)
             except Exception as ex:
                 print("ERROR RUN_F " + str(ex) + "\n" + traceback.format_exc())
-            unset_scope(scopes, test_item)
+            unset_scope(coordinator, test_item)
+
+            scope_ids = [test_item.scopes[name] for name in lymbo._local_scope_names]
+            remaining.subtract(scope_ids)
+            teardown_local_resources(
+                scope_id for scope_id in scope_ids if remaining[scope_id] <= 0
+            )
 
     except Exception as ex:
         print("ERROR RUN_TESTS " + str(ex))
 
+    finally:
+        teardown_local_resources(list(lymbo._worker_resources))
+        lymbo._local_scopes = set()
+        if lymbo._resources_cache:
+            # the scopes completed by the other workers
+            evict_resources(coordinator.released(list(lymbo._resources_cache)))
+        logger().debug(
+            f"run_tests - resources cache: {lymbo._resources_cache_hits} hits,"
+            f" {lymbo._resources_cache_misses} misses"
+        )
+
+    return os.getpid(), lymbo._worker_startup, time.time()
+
 
 @trace_call
 def run_test(test_item: TestItem):
@@ -150,7 +332,7 @@ def run_test(test_item: TestItem):
 
     with patch.object(sys, "path", syspath):
 
-        module = __import__(str(path.name[:-3]))
+        module = import_test_module(path)
         if cls:
             classdef = getattr(module, cls)
             self = classdef()
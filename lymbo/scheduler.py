@@ -0,0 +1,169 @@
+from collections import Counter
+import concurrent.futures
+from enum import Enum
+from typing import Callable
+from typing import Mapping
+from typing import Optional
+from typing import TypeVar
+
+from lymbo.env import LYMBO_TEST_SCOPE_CLASS
+from lymbo.env import LYMBO_TEST_SCOPE_GLOBAL
+from lymbo.env import LYMBO_TEST_SCOPE_MODULE
+from lymbo.item import TestItem
+from lymbo.item import TestPlan
+
+T = TypeVar("T")
+
+
+def expected_cost(
+    tests: list[TestItem], durations: Mapping[str, float], default: float
+) -> float:
+    """The expected duration of a group of tests."""
+    return sum(durations.get(test.uuid, default) for test in tests)
+
+
+class ScheduleMode(Enum):
+    DURATION = "duration"  # the longest groups first
+    SCOPE = "scope"  # the groups of a module, then of a class, one after the other
+
+
+def schedule(
+    test_plan: TestPlan,
+    durations: Optional[Mapping[str, float]] = None,
+    mode: ScheduleMode = ScheduleMode.DURATION,
+) -> list[list[TestItem]]:
+    """Order the groups of tests, the longest first (LPT).
+
+    The durations of the tests (in seconds, by uuid) are those of the previous runs.
+    A test without known duration is expected to last as long as the mean duration,
+    so without history the largest groups are executed first. The groups with the
+    same expected cost keep the order of the test plan.
+
+    With the scope mode, all the groups of a module are executed one after the
+    other (the longest module first), and so are the groups of a class in its module.
+    The resources shared in a module or in a class are released as soon as possible.
+    """
+
+    durations = durations if durations else {}
+
+    default = sum(durations.values()) / len(durations) if durations else 1.0
+
+    cost = {id(tests): expected_cost(tests, durations, default) for tests in test_plan}
+
+    if mode == ScheduleMode.DURATION:
+        return sorted(test_plan, key=lambda tests: cost[id(tests)], reverse=True)
+
+    # the cost of each module and of each class
+    scopes_cost: dict[str, float] = {}
+    for tests in test_plan:
+        for scope in (LYMBO_TEST_SCOPE_MODULE, LYMBO_TEST_SCOPE_CLASS):
+            scope_id = tests[0].scopes[scope]
+            scopes_cost[scope_id] = scopes_cost.get(scope_id, 0.0) + cost[id(tests)]
+
+    # the scopes with the same cost keep the order of the test plan
+    order = {scope: position for position, scope in enumerate(scopes_cost)}
+
+    def key(tests: list[TestItem]) -> tuple:
+        module = tests[0].scopes[LYMBO_TEST_SCOPE_MODULE]
+        cls = tests[0].scopes[LYMBO_TEST_SCOPE_CLASS]
+        return (
+            -scopes_cost[module],
+            order[module],
+            -scopes_cost[cls],
+            order[cls],
+            -cost[id(tests)],
+        )
+
+    return sorted(test_plan, key=key)
+
+
+# the scope of the resources which stay alive after the test, by kind of scope
+SHARED_SCOPES = {
+    "global": LYMBO_TEST_SCOPE_GLOBAL,
+    "pool": LYMBO_TEST_SCOPE_GLOBAL,  # the instances are kept in the global scope
+    "module": LYMBO_TEST_SCOPE_MODULE,
+    "class": LYMBO_TEST_SCOPE_CLASS,
+}
+
+
+def shared_resources(tests: list[TestItem]) -> set[tuple[str, str]]:
+    """The resources shared in a scope by a group of tests, known from the
+    collection, as (scope_id, resource)."""
+    return {
+        (test.scopes[SHARED_SCOPES[resource.scope]], str(resource))
+        for test in tests
+        for resource in test.resources
+        if resource.scope in SHARED_SCOPES
+    }
+
+
+def shared_scopes(tests: list[TestItem]) -> set[str]:
+    """The scopes of a group of tests which can share a resource after the test."""
+    return {
+        test.scopes[scope_name]
+        for test in tests
+        for scope_name in set(SHARED_SCOPES.values())
+    }
+
+
+def submit_groups(
+    executor: concurrent.futures.Executor,
+    fn: Callable[[list[TestItem]], T],
+    groups: list[list[TestItem]],
+    max_live_resources: Optional[int] = None,
+) -> list[concurrent.futures.Future[T]]:
+    """Submit the groups to the executor, in this order.
+
+    With max_live_resources, a group is submitted only when the resources it
+    shares in the global, module and class scopes (see shared_resources) and
+    those still alive are at most max_live_resources. A resource is alive until
+    the last group of its scope is finished. A group is always submitted if no
+    other group is in progress.
+    """
+
+    futures = []
+
+    # the number of groups not finished yet, by scope
+    remaining = Counter(
+        scope_id for tests in groups for scope_id in shared_scopes(tests)
+    )
+    live: set[tuple[str, str]] = set()  # the resources alive, as (scope_id, resource)
+    in_progress: dict[concurrent.futures.Future[T], list[TestItem]] = {}
+
+    for tests in groups:
+        resources = shared_resources(tests) if max_live_resources else set()
+
+        while (
+            max_live_resources
+            and (len(live | resources) > max_live_resources)
+            and in_progress
+        ):
+            done, _ = concurrent.futures.wait(
+                in_progress, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                remaining.subtract(shared_scopes(in_progress.pop(future)))
+            # the resources of the closed scopes are torn down
+            live = {
+                (scope_id, resource)
+                for scope_id, resource in live
+                if remaining[scope_id] > 0
+            }
+
+        live |= resources
+
+        future = executor.submit(fn, tests)
+        futures.append(future)
+        in_progress[future] = tests
+
+    return futures
+
+
+def tail_latency(ends: Mapping[int, float]) -> float:
+    """The time between the first worker going idle and the end of the run.
+
+    ends: the time when each worker (by pid) has finished its last group.
+    """
+    if not ends:
+        return 0.0
+    return max(ends.values()) - min(ends.values())
@@ -0,0 +1,117 @@
+import ast
+import builtins
+from collections import Counter
+from typing import Any
+from typing import Callable
+
+from lymbo.cm import args
+from lymbo.cm import expand
+from lymbo.cm import expected
+from lymbo.exception import LymboExceptionNotLiteral
+
+LYMBO_FUNCTIONS: dict[str, Callable] = {
+    "args": args,
+    "expand": expand,
+    "expected": expected,
+}
+
+
+class LiteralEvaluator:
+    """Evaluate the arguments of the lymbo.test decorators without executing the module.
+
+    Only the calls to args, expand and expected are evaluated, and their own
+    arguments must be literals or builtin types (like float or ZeroDivisionError).
+    """
+
+    def __init__(self, tree: ast.Module):
+
+        bindings: Counter = Counter()  # how many times a name is bound in the module
+        self.functions: dict[str, Callable] = {}  # from lymbo import args
+        self.modules: set[str] = set()  # import lymbo
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    name = alias.asname if alias.asname else alias.name.split(".")[0]
+                    bindings[name] += 1
+                    if (alias.asname is None and name == "lymbo") or (
+                        alias.name in ("lymbo", "lymbo.cm")
+                    ):
+                        self.modules.add(name)
+            elif isinstance(node, ast.ImportFrom):
+                for alias in node.names:
+                    name = alias.asname if alias.asname else alias.name
+                    bindings[name] += 1
+                    if (
+                        node.level == 0
+                        and node.module in ("lymbo", "lymbo.cm")
+                        and alias.name in LYMBO_FUNCTIONS
+                    ):
+                        self.functions[name] = LYMBO_FUNCTIONS[alias.name]
+            elif isinstance(
+                node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+            ):
+                bindings[node.name] += 1
+            elif isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+                bindings[node.id] += 1
+
+        # a name bound more than once may not refer to what we expect
+        self.functions = {
+            name: function
+            for name, function in self.functions.items()
+            if bindings[name] == 1
+        }
+        self.modules = {name for name in self.modules if bindings[name] == 1}
+        self.bound_names = set(bindings)
+
+    def __call__(self, node: ast.expr) -> Any:
+        """Evaluate a call to args, expand or expected."""
+
+        if not isinstance(node, ast.Call):
+            raise LymboExceptionNotLiteral(self.describe(node))
+
+        function = self.function(node.func)
+
+        args = [self.value(arg) for arg in node.args]
+
+        kwargs = {}
+        for kw in node.keywords:
+            if kw.arg is None:  # **kwargs
+                raise LymboExceptionNotLiteral(self.describe(kw.value))
+            kwargs[kw.arg] = self.value(kw.value)
+
+        return function(*args, **kwargs)
+
+    def function(self, node: ast.expr) -> Callable:
+
+        if isinstance(node, ast.Name) and node.id in self.functions:
+            return self.functions[node.id]
+
+        if (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in self.modules
+            and node.attr in LYMBO_FUNCTIONS
+        ):
+            return LYMBO_FUNCTIONS[node.attr]
+
+        raise LymboExceptionNotLiteral(self.describe(node))
+
+    def value(self, node: ast.expr) -> Any:
+
+        if isinstance(node, ast.Call):
+            return self(node)
+
+        if isinstance(node, ast.Name) and node.id not in self.bound_names:
+            builtin = getattr(builtins, node.id, None)
+            if isinstance(builtin, type):
+                return builtin
+
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, TypeError):
+            raise LymboExceptionNotLiteral(self.describe(node))
+
+    @staticmethod
+    def describe(node: ast.expr) -> str:
+        return f"line {node.lineno}: [{ast.unparse(node)}] is not a literal"
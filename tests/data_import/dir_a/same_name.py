@@ -0,0 +1,8 @@
+import lymbo
+
+DIRECTORY = "dir_a"
+
+
+@lymbo.test()
+def which_directory():
+    print(DIRECTORY)
@@ -0,0 +1,8 @@
+import lymbo
+
+DIRECTORY = "dir_b"
+
+
+@lymbo.test()
+def which_directory():
+    print(DIRECTORY)
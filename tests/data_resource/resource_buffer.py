@@ -0,0 +1,25 @@
+from contextlib import contextmanager
+
+import lymbo
+from lymbo import args
+from lymbo import expand
+from lymbo import scope_global
+
+
+@contextmanager
+def dataset():
+    yield bytes(range(256)) * 4096
+
+
+@lymbo.test(args(r=expand(1, 2, 3, 4)))
+def scope_global_buffer(r):
+    with scope_global(dataset) as data:
+        print(
+            '{"type": "'
+            + type(data).__name__
+            + '", "readonly": '
+            + str(int(getattr(data, "readonly", True)))
+            + ', "equal": '
+            + str(int(data == bytes(range(256)) * 4096))
+            + "}"
+        )
@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+
+import lymbo
+from lymbo import args
+from lymbo import expand
+from lymbo import scope_global
+from lymbo import scope_module
+
+from cm import resource_cm
+
+
+@lymbo.test(args(r=expand(1, 2)))
+def scope_failure_wrong_args(r):
+    with scope_module(resource_cm, 1):
+        pass
+
+
+@contextmanager
+def resource_failing():
+    raise RuntimeError("the setup has failed")
+    yield
+
+
+@lymbo.test(args(r=expand(1, 2)))
+def scope_failure_prewarm(r):
+    with scope_global(resource_failing):
+        pass
@@ -0,0 +1,20 @@
+from contextlib import contextmanager
+import os
+import threading
+
+import lymbo
+from lymbo import args
+from lymbo import expand
+from lymbo import scope_function
+
+
+@contextmanager
+def unpicklable():
+    yield threading.Lock(), os.getpid()
+
+
+@lymbo.test(args(r=expand(1, 2, 3)))
+def scope_function_local(r):
+    with scope_function(unpicklable) as (lock, pid):
+        with lock:
+            print('{"pid": ' + str(pid) + ', "worker": ' + str(os.getpid()) + "}")
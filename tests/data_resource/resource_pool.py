@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+import random
+import time
+
+import lymbo
+from lymbo import args
+from lymbo import expand
+from lymbo import scope_pool
+
+
+@contextmanager
+def resource_pooled():
+    yield random.randint(0, 9999999)
+
+
+@lymbo.test(args(r=expand(1, 2, 3, 4, 5, 6, 7, 8)))
+def scope_pool_lease(r):
+    with scope_pool(resource_pooled, pool_size=2) as value:
+        start = time.time()
+        time.sleep(0.2)
+        print(
+            '{"scope": "pool", "value": "'
+            + str(value)
+            + '", "start": '
+            + str(start)
+            + ', "end": '
+            + str(time.time())
+            + "}"
+        )
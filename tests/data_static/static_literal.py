@@ -0,0 +1,26 @@
+import lymbo
+from lymbo import args
+from lymbo import expand
+from lymbo import expected
+
+
+@lymbo.test()
+def no_args():
+    pass
+
+
+@lymbo.test(args(1, "a", (2, 3), p=expand(-1, None, [4, 5])), expected(int))
+def literals(a, b, c, p):
+    return 1
+
+
+@lymbo.test(args(a=4, b=0), expected=expected(ZeroDivisionError))
+def division(a, b):
+    return a / b
+
+
+class test_class:
+
+    @lymbo.test(lymbo.args(p=lymbo.expand(1, 2)), lymbo.expected(match="ok"))
+    def in_class(self, p):
+        return "ok"
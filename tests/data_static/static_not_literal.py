@@ -0,0 +1,10 @@
+import lymbo
+from lymbo import args
+from lymbo import expand
+
+VALUES = (1, 2, 3)
+
+
+@lymbo.test(args(v=expand(*VALUES)))
+def not_literal(v):
+    pass
@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+from lymbo.cache import CollectionCache
+from lymbo.collect import collect_tests
+from lymbo.collect import CollectStats
+from lymbo.item import GroupBy
+
+dir = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestCollectionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.tests_dir = Path(self.tmp, "tests")
+        shutil.copytree(os.path.join(dir, "data_resource"), self.tests_dir)
+        self.cache = CollectionCache(Path(self.tmp, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def collect(self, group_by=GroupBy.NONE):
+        stats = CollectStats()
+        test_plan = collect_tests(
+            [self.tests_dir / "resource_a.py"], group_by, cache=self.cache, stats=stats
+        )
+        return test_plan, stats
+
+    def test_cache_hit(self):
+
+        test_plan_miss, stats = self.collect()
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (0, 1))
+
+        test_plan_hit, stats = self.collect()
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (1, 0))
+
+        self.assertEqual(test_plan_hit.count, test_plan_miss.count)
+        self.assertListEqual(
+            [str(test) for group in test_plan_hit for test in group],
+            [str(test) for group in test_plan_miss for test in group],
+        )
+
+    def test_cache_group_by(self):
+
+        _ = self.collect(GroupBy.NONE)
+
+        test_plan, stats = self.collect(GroupBy.MODULE)
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (0, 1))
+        self.assertEqual(test_plan.count, (20, 1))
+
+    def test_cache_file_touched(self):
+
+        _ = self.collect()
+
+        os.utime(self.tests_dir / "resource_a.py", (0, 0))
+
+        _, stats = self.collect()
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (1, 0))
+
+    def test_cache_file_modified(self):
+
+        _ = self.collect()
+
+        with open(self.tests_dir / "resource_a.py", "a") as f:
+            f.write("\n\n@lymbo.test()\ndef new_test():\n    pass\n")
+
+        test_plan, stats = self.collect()
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (0, 1))
+        self.assertEqual(test_plan.count, (21, 21))
+
+    def test_cache_local_module_modified(self):
+
+        _ = self.collect()
+
+        with open(self.tests_dir / "cm.py", "a") as f:
+            f.write("\n# modified\n")
+
+        _, stats = self.collect()
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (0, 1))
+
+    def test_cache_indirect_local_module_modified(self):
+
+        # resource_a.py imports cm.py, which imports helper.py
+        with open(self.tests_dir / "helper.py", "w") as f:
+            f.write("VALUE = 1\n")
+        with open(self.tests_dir / "cm.py", "a") as f:
+            f.write("\nimport helper  # noqa\n")
+
+        _ = self.collect()
+
+        _, stats = self.collect()
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (1, 0))
+
+        with open(self.tests_dir / "helper.py", "a") as f:
+            f.write("# modified\n")
+
+        _, stats = self.collect()
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,21 +12,21 @@ class TestArgs(unittest.TestCase):
     @unittest.mock.patch.dict(os.environ, {LYMBO_TEST_COLLECTION: "1"})
     def test_args_default(self):
 
-        flattened_args = args()
+        flattened_args = list(args())
 
         self.assertEqual(flattened_args, [((), {})])
 
     @unittest.mock.patch.dict(os.environ, {LYMBO_TEST_COLLECTION: "1"})
     def test_args_no_param(self):
 
-        flattened_args = args(123, "hello", name="opt")
+        flattened_args = list(args(123, "hello", name="opt"))
 
         self.assertEqual(flattened_args, [((123, "hello"), {"name": "opt"})])
 
     @unittest.mock.patch.dict(os.environ, {LYMBO_TEST_COLLECTION: "1"})
     def test_args_no_param_list(self):
 
-        flattened_args = args(123, ["hello", "salut"], name=["opt", "glo"])
+        flattened_args = list(args(123, ["hello", "salut"], name=["opt", "glo"]))
 
         self.assertEqual(
             flattened_args,
@@ -36,7 +36,7 @@ class TestArgs(unittest.TestCase):
     @unittest.mock.patch.dict(os.environ, {LYMBO_TEST_COLLECTION: "1"})
     def test_args_one_param_arg(self):
 
-        flattened_args = args(123, expand("hello", "salut"), name="opt")
+        flattened_args = list(args(123, expand("hello", "salut"), name="opt"))
 
         self.assertEqual(
             flattened_args,
@@ -46,7 +46,7 @@ class TestArgs(unittest.TestCase):
     @unittest.mock.patch.dict(os.environ, {LYMBO_TEST_COLLECTION: "1"})
     def test_args_one_param_kwarg(self):
 
-        flattened_args = args(123, "salut", name=expand("opt", "glo"))
+        flattened_args = list(args(123, "salut", name=expand("opt", "glo")))
 
         self.assertEqual(
             flattened_args,
@@ -56,8 +56,8 @@ class TestArgs(unittest.TestCase):
     @unittest.mock.patch.dict(os.environ, {LYMBO_TEST_COLLECTION: "1"})
     def test_args_many_params(self):
 
-        flattened_args = args(
-            123, expand("salut", "hello", "ciao"), name=expand("opt", "glo")
+        flattened_args = list(
+            args(123, expand("salut", "hello", "ciao"), name=expand("opt", "glo"))
         )
 
         self.assertCountEqual(
@@ -72,6 +72,28 @@ class TestArgs(unittest.TestCase):
             ],
         )
 
+    @unittest.mock.patch.dict(os.environ, {LYMBO_TEST_COLLECTION: "1"})
+    def test_args_order(self):
+
+        flattened_args = list(args(expand(1, 2), b=expand("x", "y")))
+
+        self.assertListEqual(
+            flattened_args,
+            [
+                ((1,), {"b": "x"}),
+                ((2,), {"b": "x"}),
+                ((1,), {"b": "y"}),
+                ((2,), {"b": "y"}),
+            ],
+        )
+
+    @unittest.mock.patch.dict(os.environ, {LYMBO_TEST_COLLECTION: "1"})
+    def test_args_count(self):
+
+        self.assertEqual(len(args()), 1)
+        self.assertEqual(len(args(123, expand(1, 2, 3), name=expand(1, 2))), 6)
+        self.assertEqual(len(args(123, expand(), name=expand(1, 2))), 0)
+
     def test_args_not_in_collect(self):
 
         self.assertIsNone(
@@ -1,12 +1,23 @@
+import ast
 import os
 from pathlib import Path
+import tempfile
 import unittest
 
+from lymbo.cache import CollectionCache
 from lymbo.collect import collect_tests
+from lymbo.collect import CollectStats
+from lymbo.collect import count_tests
 from lymbo.collect import extract_words_from_filter
+from lymbo.collect import find_resources
+from lymbo.collect import list_python_files
 from lymbo.collect import match_filter
+from lymbo.env import LYMBO_MAX_PARAMS_PER_TEST
+from lymbo.env import LYMBO_TEST_COLLECTION
 from lymbo.exception import LymboExceptionFilter
+from lymbo.exception import LymboExceptionParameters
 from lymbo.item import GroupBy
+from lymbo.item import ResourceUsage
 
 dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -47,6 +58,65 @@ class TestCollect(unittest.TestCase):
 
         self.assertEqual(test_plan.count, (11, 2))
 
+    # count
+
+    def test_count_tests(self):
+
+        for group_by in GroupBy:
+            for static in (False, True):
+                with self.subTest(f"group_by={group_by} static={static}"):
+                    paths = [
+                        Path(os.path.join(dir, "data_collect")),
+                        Path(os.path.join(dir, "data_resource")),
+                        Path(os.path.join(dir, "data_static")),
+                    ]
+                    self.assertEqual(
+                        count_tests(paths, group_by, static),
+                        collect_tests(paths, group_by).count,
+                    )
+
+    def test_count_tests_max_params_per_test(self):
+
+        path = Path(os.path.join(dir, "data_collect"))
+
+        for static in (False, True):
+            with self.subTest(f"static={static}"):
+                self.assertEqual(
+                    count_tests([path], GroupBy.NONE, static, max_params_per_test=6),
+                    (11, 11),
+                )
+
+                with self.assertRaises(LymboExceptionParameters):
+                    count_tests([path], GroupBy.NONE, static, max_params_per_test=5)
+
+        with self.subTest("the environment is restored when the count fails"):
+            self.assertNotIn(LYMBO_TEST_COLLECTION, os.environ)
+            self.assertNotIn(LYMBO_MAX_PARAMS_PER_TEST, os.environ)
+
+    def test_collect_tests_max_params_per_test(self):
+
+        path = Path(os.path.join(dir, "data_collect"))
+
+        self.assertEqual(
+            collect_tests([path], GroupBy.NONE, max_params_per_test=6).count, (11, 11)
+        )
+
+        with self.assertRaises(LymboExceptionParameters):
+            collect_tests([path], GroupBy.NONE, max_params_per_test=5)
+
+        with self.subTest("the environment is restored when the collection fails"):
+            self.assertNotIn(LYMBO_TEST_COLLECTION, os.environ)
+            self.assertNotIn(LYMBO_MAX_PARAMS_PER_TEST, os.environ)
+
+        with self.subTest("the maximum is checked with a warm cache"):
+            with tempfile.TemporaryDirectory() as tmp:
+                cache = CollectionCache(Path(tmp))
+                collect_tests([path], GroupBy.NONE, cache=cache)
+                with self.assertRaises(LymboExceptionParameters):
+                    collect_tests(
+                        [path], GroupBy.NONE, cache=cache, max_params_per_test=5
+                    )
+
     # list files
 
     def test_collect_tests_dir_not_exists(self):
@@ -85,6 +155,100 @@ class TestCollect(unittest.TestCase):
 
         self.assertEqual(test_plan.count, (11, 11))
 
+    def test_list_python_files_sorted(self):
+
+        files = list_python_files(
+            [Path(os.path.join(dir, "data_resource")), Path(dir, "data_collect")]
+        )
+
+        self.assertListEqual(
+            [path.name for path in files],
+            [
+                "cm.py",
+                "resource_a.py",
+                "resource_b.py",
+                "resource_buffer.py",
+                "resource_failure.py",
+                "resource_local.py",
+                "resource_nested.py",
+                "resource_pool.py",
+                "collect_a.py",
+                "collect_b.py",
+            ],
+        )
+
+    def test_list_python_files_patterns(self):
+
+        files = list_python_files(
+            [Path(dir)],
+            include=["data_*/*.py"],
+            exclude=["data_run", "data_import", "resource_*"],
+        )
+
+        self.assertListEqual(
+            [path.name for path in files],
+            [
+                "collect_a.py",
+                "collect_b.py",
+                "cm.py",
+                "static_literal.py",
+                "static_not_literal.py",
+            ],
+        )
+
+    # parallel collection
+
+    def test_collect_tests_parallel(self):
+
+        paths = [
+            Path(os.path.join(dir, "data_collect")),
+            Path(os.path.join(dir, "data_resource")),
+        ]
+
+        test_plan_sequential = collect_tests(paths, GroupBy.CLASS)
+        test_plan_parallel = collect_tests(paths, GroupBy.CLASS, max_workers=2)
+
+        self.assertEqual(test_plan_parallel.count, test_plan_sequential.count)
+        self.assertListEqual(
+            [[str(test) for test in group] for group in test_plan_parallel],
+            [[str(test) for test in group] for group in test_plan_sequential],
+        )
+
+    # static collection
+
+    def test_collect_tests_static(self):
+
+        for path in ("data_collect", "data_resource", "data_static"):
+            with self.subTest(path):
+                stats = CollectStats()
+                test_plan_static = collect_tests(
+                    [Path(os.path.join(dir, path))],
+                    GroupBy.CLASS,
+                    stats=stats,
+                    static=True,
+                )
+                test_plan = collect_tests(
+                    [Path(os.path.join(dir, path))], GroupBy.CLASS
+                )
+
+                self.assertListEqual(
+                    [[str(test) for test in group] for group in test_plan_static],
+                    [[str(test) for test in group] for group in test_plan],
+                )
+
+    def test_collect_tests_static_executed_modules(self):
+
+        stats = CollectStats()
+        test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_static"))],
+            GroupBy.NONE,
+            stats=stats,
+            static=True,
+        )
+
+        self.assertEqual(test_plan.count, (10, 10))
+        self.assertEqual(stats.executed_modules, 1)
+
     # filters
 
     def test_extract_words(self):
@@ -120,6 +284,9 @@ class TestCollect(unittest.TestCase):
             "abc/def/ijk.py::func5": "abc and def",
             "abc/def/ijk.py::func6": "abc and def and not ABC",
             "abc/def/ijk.py::func7": "rrrandrr or ijk",
+            "abc/def/ijk.py::func8": "abc/*/ijk.py and not func?0",
+            "abc/def/ijk.py::func9": "re:func[0-9]$ and not re:^def",
+            "abc/def/ijk.py::func(a=1)": "'func(a=1)' or \"(\"",
         }
 
         for item, filter in params.items():
@@ -136,12 +303,31 @@ class TestCollect(unittest.TestCase):
             "abc/def/ijk.py::func4": "not def",
             "abc/def/ijk.py::func5": "abc and not def",
             "abc/def/ijk.py::func6": "not abc or (DEF and not ABC)",
+            "abc/def/ijk.py::func7": "abc/*/ijk.py and not func?",
+            "abc/def/ijk.py::func8": "re:^def",
         }
 
         for item, filter in params.items():
             with self.subTest(f'item="{item}" filter="{filter}"'):
                 self.assertFalse(match_filter(item, filter))
 
+    def test_match_filter_broken(self):
+
+        params = {
+            "abc )": 'Unexpected ")" at position 4.',
+            "(abc or def": "The parenthesis at position 0 is not closed.",
+            "abc and": "A term is missing at the end of the filter.",
+            "abc def": 'Unexpected "def" at position 4.',
+            "re:abc[": "The regular expression at position 0 is not valid",
+            "'abc": "The quote at position 0 is not closed.",
+        }
+
+        for filter, message in params.items():
+            with self.subTest(f'filter="{filter}"'):
+                with self.assertRaises(LymboExceptionFilter) as cm:
+                    match_filter("abc", filter)
+                self.assertIn(message, str(cm.exception))
+
     def test_collect_tests_filter(self):
 
         test_plan = collect_tests(
@@ -162,6 +348,52 @@ class TestCollect(unittest.TestCase):
         except Exception as ex:
             self.assertIsInstance(ex, LymboExceptionFilter)
 
+    # resources
+
+    def test_find_resources(self):
+
+        source = """
+@lymbo.test()
+def test():
+    with scope_module(cm) as a, lymbo.scope_class(module.cm, 1, b="2") as b:
+        with scope_global(cm, value) as c:
+            pass
+    with open("file") as f:
+        pass
+"""
+        item = ast.parse(source).body[0]
+
+        resources = find_resources(item)
+
+        self.assertListEqual(
+            [str(resource) for resource in resources],
+            [
+                "scope_module(cm)",
+                "scope_class(module.cm, 1, b='2')",
+                "scope_global(cm, ...)",
+            ],
+        )
+        self.assertEqual(
+            resources[1], ResourceUsage("class", "module.cm", (1,), {"b": "2"})
+        )
+
+    def test_collect_tests_resources(self):
+
+        test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_resource/resource_a.py"))], GroupBy.NONE
+        )
+
+        resources = {tests[0].fnc: tests[0].resources for tests in test_plan}
+
+        with self.subTest("test without shared resource"):
+            self.assertEqual(resources["no_scope"], ())
+
+        with self.subTest("test with a shared resource"):
+            self.assertEqual(
+                resources["scope_module_1"],
+                (ResourceUsage("module", "resource_cm", (), {}),),
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
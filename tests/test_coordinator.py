@@ -0,0 +1,190 @@
+import os
+from pathlib import Path
+import threading
+import unittest
+
+from lymbo.collect import collect_tests
+from lymbo.coordinator import CoordinatorManager
+from lymbo.coordinator import ScopeCoordinator
+from lymbo.env import LYMBO_TEST_SCOPE_FUNCTION
+from lymbo.env import LYMBO_TEST_SCOPE_GLOBAL
+from lymbo.item import GroupBy
+from lymbo.resource_manager import count_scopes
+from lymbo.resource_manager import local_scopes
+from lymbo.resource_manager import prepare_scopes
+
+dir = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestScopeCoordinator(unittest.TestCase):
+
+    def test_count(self):
+
+        coordinator = ScopeCoordinator()
+
+        coordinator.add_tests(
+            {"global": 2, "module_a": 2, "function_a": 1, "function_b": 1}
+        )
+
+        with self.subTest("the tests are counted by scope"):
+            self.assertEqual(coordinator.count("global"), 2)
+            self.assertEqual(coordinator.count("function_a"), 1)
+
+        released = coordinator.finish_test(["global", "module_a", "function_a"])
+
+        with self.subTest("the scopes closed by the test are returned"):
+            self.assertListEqual(released, ["function_a"])
+
+        with self.subTest("only the scopes without remaining test are released"):
+            self.assertListEqual(
+                coordinator.released(["global", "module_a", "function_a"]),
+                ["function_a"],
+            )
+
+        coordinator.stop("global")
+
+        with self.subTest("the scope is stopped"):
+            self.assertEqual(coordinator.count("global"), 0)
+
+    def test_resource(self):
+
+        coordinator = ScopeCoordinator()
+
+        with self.subTest("only the first caller creates the resource"):
+            self.assertTrue(coordinator.acquire("module_a", "cm"))
+            self.assertFalse(coordinator.acquire("module_a", "cm"))
+            self.assertTrue(coordinator.acquire("module_b", "cm"))
+
+        with self.subTest("the setup is in progress"):
+            self.assertIsNone(coordinator.get_resource("module_a", "cm"))
+
+        coordinator.set_resource("module_a", "cm", b"resource", "output")
+
+        with self.subTest("the resource is shared"):
+            self.assertEqual(
+                coordinator.get_resource("module_a", "cm"), (b"resource", "output")
+            )
+
+    def test_wait_resource(self):
+
+        coordinator = ScopeCoordinator()
+        coordinator.acquire("module_a", "cm")
+
+        with self.subTest("the setup has not completed in time"):
+            self.assertIsNone(coordinator.wait_resource("module_a", "cm", 0.1))
+
+        timer = threading.Timer(
+            0.1, coordinator.set_resource, ("module_a", "cm", b"resource", "")
+        )
+        timer.start()
+
+        with self.subTest("the waiter is notified when the resource is shared"):
+            self.assertEqual(
+                coordinator.wait_resource("module_a", "cm", 10), (b"resource", "")
+            )
+
+        timer.join()
+
+    def test_lease(self):
+
+        coordinator = ScopeCoordinator()
+
+        with self.subTest("a new instance is leased until the pool is full"):
+            self.assertEqual(coordinator.lease("global", "pool", 2), 0)
+            self.assertEqual(coordinator.lease("global", "pool", 2), 1)
+
+        with self.subTest("all the instances are leased"):
+            self.assertIsNone(coordinator.lease("global", "pool", 2, 0.1))
+
+        timer = threading.Timer(0.1, coordinator.give_back, ("global", "pool", 1))
+        timer.start()
+
+        with self.subTest("the waiter is notified when an instance is given back"):
+            self.assertEqual(coordinator.lease("global", "pool", 2, 10), 1)
+
+        timer.join()
+
+    def test_messages(self):
+
+        coordinator = ScopeCoordinator()
+        coordinator.add_tests({"module_a": 1, "module_b": 1})
+
+        for scope_id in ("module_a", "module_b"):
+            coordinator.acquire(scope_id, "cm")
+            coordinator.set_resource(scope_id, "cm", b"resource", "", owner="rm_1")
+
+        coordinator.put_message({"stop": False, "resource": "cm"})
+
+        with self.subTest("the setup requests are shared"):
+            self.assertEqual(
+                coordinator.next_message("rm_2", 0.1), {"stop": False, "resource": "cm"}
+            )
+            self.assertIsNone(coordinator.next_message("rm_1", 0.1))
+
+        coordinator.finish_test(["module_a"])
+
+        with self.subTest("the closed scope is sent to its resource manager only"):
+            self.assertIsNone(coordinator.next_message("rm_2", 0.1))
+            self.assertEqual(
+                coordinator.next_message("rm_1", 0.1),
+                {"stop": False, "teardown": ["module_a"]},
+            )
+
+        timer = threading.Timer(0.1, coordinator.stop, ("module_b",))
+        timer.start()
+
+        with self.subTest("the resource manager is notified when a scope is closed"):
+            self.assertEqual(
+                coordinator.next_message("rm_1", 10),
+                {"stop": False, "teardown": ["module_b"]},
+            )
+
+        timer.join()
+
+    def test_manager(self):
+
+        with CoordinatorManager() as manager:
+            coordinator = manager.ScopeCoordinator()
+
+            coordinator.add_tests({"global": 1, "module_a": 1})
+            coordinator.finish_test(["global", "module_a"])
+
+            self.assertListEqual(
+                coordinator.released(["global", "module_a"]), ["global", "module_a"]
+            )
+
+
+class TestPrepareScopes(unittest.TestCase):
+
+    def test_prepare_scopes(self):
+
+        path = Path(os.path.join(dir, "data_resource/resource_a.py"))
+        test_plan = collect_tests([path], GroupBy.NONE)
+
+        with CoordinatorManager() as manager:
+            coordinator = prepare_scopes(test_plan, manager)
+
+            with self.subTest("all the tests are in the global scope"):
+                self.assertEqual(coordinator.count(LYMBO_TEST_SCOPE_GLOBAL), 20)
+
+            with self.subTest("all the tests are in the module scope"):
+                self.assertEqual(coordinator.count(str(path)), 20)
+
+    def test_local_scopes(self):
+
+        path = Path(os.path.join(dir, "data_resource/resource_local.py"))
+        scope_id = f"{path}::scope_function_local"
+
+        for group_by, local in ((GroupBy.FUNCTION, {scope_id}), (GroupBy.NONE, set())):
+            with self.subTest(group_by=group_by):
+                test_plan = collect_tests([path], group_by)
+                counts = count_scopes(test_plan, (LYMBO_TEST_SCOPE_FUNCTION,))
+                for tests in test_plan:
+                    self.assertSetEqual(
+                        local_scopes(tests, counts, (LYMBO_TEST_SCOPE_FUNCTION,)),
+                        local,
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
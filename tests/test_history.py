@@ -0,0 +1,96 @@
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+from lymbo.collect import collect_tests
+from lymbo.history import HISTORY_SIZE
+from lymbo.history import percentile
+from lymbo.history import TestHistory
+from lymbo.item import GroupBy
+from lymbo.item import TestStatus
+
+dir = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestTestHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.history = TestHistory(Path(self.tmp))
+        self.test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_run/run_status.py"))], GroupBy.NONE
+        )
+        self.tests = {test.fnc: test for tests in self.test_plan for test in tests}
+
+    def tearDown(self):
+        self.history.close()
+        shutil.rmtree(self.tmp)
+
+    def run_tests(self, durations, run_at):
+        for fnc, duration in durations.items():
+            test = self.tests[fnc]
+            test.start_at = run_at
+            test.end_at = run_at + duration
+            test.status = TestStatus.PASSED
+        self.history.add(self.test_plan, run_at)
+
+    def test_percentile(self):
+
+        durations = [float(d) for d in range(1, 101)]
+
+        self.assertEqual(percentile(durations, 50), 50.0)
+        self.assertEqual(percentile(durations, 95), 95.0)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+
+    def test_durations(self):
+
+        for run in range(10):
+            self.run_tests({"passed": run + 1.0, "failed": 0.5}, run * 100.0)
+
+        durations = self.history.durations()
+
+        with self.subTest("the tests not executed are not saved"):
+            self.assertNotIn(self.tests["broken"].uuid, durations)
+
+        with self.subTest("the percentiles of a test"):
+            passed = durations[self.tests["passed"].uuid]
+            self.assertEqual(passed.name, str(self.tests["passed"]))
+            self.assertEqual((passed.runs, passed.p50, passed.p95), (10, 5.0, 10.0))
+
+        with self.subTest("the slowest tests"):
+            self.assertListEqual(
+                [durations.name for durations in self.history.slowest(1)],
+                [str(self.tests["passed"])],
+            )
+
+        with self.subTest("the expected durations for the scheduling"):
+            self.assertDictEqual(
+                self.history.expected_durations([self.tests["failed"].uuid]),
+                {self.tests["failed"].uuid: 0.5},
+            )
+
+    def test_history_size(self):
+
+        for run in range(HISTORY_SIZE + 5):
+            self.run_tests({"passed": float(run)}, float(run))
+
+        passed = self.history.durations()[self.tests["passed"].uuid]
+
+        # only the last runs are kept
+        self.assertEqual(passed.runs, HISTORY_SIZE)
+        self.assertEqual(percentile([float(d) for d in range(5, 25)], 50), passed.p50)
+
+    def test_persistence(self):
+
+        self.run_tests({"passed": 1.0}, 0.0)
+        self.history.close()
+
+        self.history = TestHistory(Path(self.tmp))
+
+        self.assertIn(self.tests["passed"].uuid, self.history.durations())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+from pathlib import Path
+import unittest
+
+from lymbo.collect import collect_tests
+from lymbo.importer import import_test_module
+from lymbo.importer import module_name_of
+from lymbo.item import GroupBy
+from lymbo.report import TestReport
+from lymbo.run import run_test_plan
+
+dir = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestImportTestModule(unittest.TestCase):
+
+    def test_same_name(self):
+
+        path_a = Path(os.path.join(dir, "data_import/dir_a/same_name.py"))
+        path_b = Path(os.path.join(dir, "data_import/dir_b/same_name.py"))
+
+        with self.subTest("the modules have different names"):
+            self.assertNotEqual(module_name_of(path_a), module_name_of(path_b))
+
+        with self.subTest("the modules are not mixed up"):
+            self.assertEqual(import_test_module(path_a).DIRECTORY, "dir_a")
+            self.assertEqual(import_test_module(path_b).DIRECTORY, "dir_b")
+
+    def test_cache(self):
+
+        path = Path(os.path.join(dir, "data_import/dir_a/same_name.py"))
+
+        self.assertIs(import_test_module(path), import_test_module(path))
+
+    def test_run_same_name(self):
+
+        test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_import"))], GroupBy.MODULE
+        )
+
+        _ = TestReport()
+
+        run_test_plan(test_plan, 1)
+
+        outputs = [
+            test.output.getvalue().strip() for group in test_plan for test in group
+        ]
+
+        self.assertListEqual(outputs, ["dir_a", "dir_b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
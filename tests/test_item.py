@@ -0,0 +1,104 @@
+import os
+from pathlib import Path
+import pickle
+import tempfile
+import unittest
+
+from lymbo.collect import collect_tests
+from lymbo.item import GroupBy
+from lymbo.item import TestItem
+
+dir = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestTestItem(unittest.TestCase):
+
+    def new_test_item(self, fnc="test_function", parameters=((1,), {"a": 2})):
+        return TestItem(Path("tests/test_a.py"), False, fnc, parameters, "cls", None)
+
+    def test_compact(self):
+
+        test = self.new_test_item()
+
+        self.assertFalse(hasattr(test, "__dict__"))
+        self.assertIsNone(test._output)
+        self.assertEqual(test.output.getvalue(), "")
+        self.assertIsNotNone(test._output)
+
+    def test_shared(self):
+
+        test_1 = self.new_test_item(parameters=((1,), {}))
+        test_2 = self.new_test_item(parameters=((2,), {}))
+
+        self.assertIs(test_1.path, test_2.path)
+        self.assertIs(test_1.scopes, test_2.scopes)
+        self.assertIs(test_1.expected, test_2.expected)
+
+    def test_uuid_stable(self):
+
+        self.assertEqual(self.new_test_item().uuid, self.new_test_item().uuid)
+        self.assertNotEqual(
+            self.new_test_item(parameters=((1,), {})).uuid,
+            self.new_test_item(parameters=((2,), {})).uuid,
+        )
+
+        paths = [Path(os.path.join(dir, "data_collect"))]
+        self.assertListEqual(
+            [
+                test.uuid
+                for group in collect_tests(paths, GroupBy.NONE)
+                for test in group
+            ],
+            [
+                test.uuid
+                for group in collect_tests(paths, GroupBy.NONE)
+                for test in group
+            ],
+        )
+
+    def test_uuid_path(self):
+
+        path = os.path.relpath(os.path.join(dir, "data_collect"))
+
+        uuids = [
+            [
+                test.uuid
+                for group in collect_tests([Path(spelling)], GroupBy.NONE)
+                for test in group
+            ]
+            for spelling in (path, os.path.join(".", path), os.path.abspath(path))
+        ]
+
+        # the same tests, however the path is written
+        self.assertListEqual(uuids[0], uuids[1])
+        self.assertListEqual(uuids[0], uuids[2])
+
+    def test_uuid_unique(self):
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "duplicate.py"), "w") as f:
+                f.write(
+                    "import lymbo\n\n"
+                    "@lymbo.test()\n@lymbo.test()\ndef duplicate():\n    pass\n"
+                )
+
+            test_plan = collect_tests([Path(tmp)], GroupBy.NONE)
+
+        uuids = [test.uuid for group in test_plan for test in group]
+        self.assertEqual(len(uuids), 2)
+        self.assertEqual(len(set(uuids)), 2)
+
+    def test_pickle(self):
+
+        test = self.new_test_item()
+        test.output.write("output")
+
+        test_unpickled = pickle.loads(pickle.dumps(test))
+
+        self.assertEqual(str(test_unpickled), str(test))
+        self.assertEqual(test_unpickled.uuid, test.uuid)
+        self.assertEqual(test_unpickled.output.getvalue(), "output")
+
+
+if __name__ == "__main__":
+    unittest.main()
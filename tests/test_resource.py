@@ -1,11 +1,35 @@
+import contextlib
 import json
 import os
 from pathlib import Path
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
+from unittest.mock import Mock
+from unittest.mock import patch
 
+import lymbo
+from lymbo.buffer import share_buffer
 from lymbo.collect import collect_tests
+from lymbo.coordinator import ScopeCoordinator
+from lymbo.env import LYMBO_RESOURCE_TIMEOUT
+from lymbo.env import LYMBO_SHARED_MEMORY_MIN_SIZE
+from lymbo.env import LYMBO_TEST_SCOPE_GLOBAL
+from lymbo.env import LYMBO_TEST_SCOPE_MAX
+from lymbo.env import LYMBO_TEST_SCOPE_MODULE
+from lymbo.exception import LymboExceptionResourceNotShareable
 from lymbo.item import GroupBy
 from lymbo.item import TestStatus
+from lymbo.resource_manager import LocalResources
+from lymbo.resource_manager import prewarm_messages
+from lymbo.resource_manager import prewarm_resource
+from lymbo.resource_manager import scope_global
+from lymbo.resource_manager import scope_module
+from lymbo.resource_manager import scope_pool
+from lymbo.resource_manager import unset_scope
 from lymbo.run import run_test_plan
 from lymbo.report import TestReport
 
@@ -68,6 +92,163 @@ class TestResource(unittest.TestCase):
             # all the resources under the same scope are identical
             self.assert_same_resource(resources, "global", 10)
 
+    def test_resource_prewarm(self):
+
+        path_a = Path(os.path.join(dir, "data_resource/resource_a.py"))
+        path_b = Path(os.path.join(dir, "data_resource/resource_b.py"))
+
+        test_plan = collect_tests([path_a, path_b], GroupBy.NONE)
+
+        _ = TestReport()
+
+        summary = run_test_plan(test_plan, prewarm=True)
+
+        resources = {}
+
+        for group in test_plan:
+            for test in group:
+                resource = json.loads(test.output.getvalue())
+                resources[resource["scope"]] = resources.get(resource["scope"], [])
+                resources[resource["scope"]].append(resource["value"])
+
+        with self.subTest("the pre-warmed resources are shared"):
+            self.assert_same_resource(resources, "module_a", 6)
+            self.assert_same_resource(resources, "module_b", 3)
+            self.assert_same_resource(resources, "global", 10)
+
+        with self.subTest("the setup of each resource is timed once"):
+            scopes = [
+                resource.rsplit(" (", 1)[1] for resource in summary.resources_setup
+            ]
+            self.assertEqual(scopes.count(f"{path_a})"), 1)
+            self.assertEqual(scopes.count(f"{path_b})"), 1)
+            self.assertEqual(scopes.count(f"{LYMBO_TEST_SCOPE_GLOBAL})"), 1)
+
+    def test_resource_pool(self):
+
+        test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_resource/resource_pool.py"))],
+            GroupBy.NONE,
+        )
+
+        _ = TestReport()
+
+        run_test_plan(test_plan, max_workers=4)
+
+        leases = []
+        for group in test_plan:
+            for test in group:
+                self.assertEqual(test.status, TestStatus.PASSED, test.output.getvalue())
+                leases.append(json.loads(test.output.getvalue()))
+
+        with self.subTest("the pool keeps at most pool_size instances"):
+            self.assertLessEqual(len({lease["value"] for lease in leases}), 2)
+
+        with self.subTest("an instance is leased to one test at a time"):
+            for lease in leases:
+                for other in leases:
+                    if (lease is not other) and (lease["value"] == other["value"]):
+                        self.assertTrue(
+                            (lease["end"] <= other["start"])
+                            or (other["end"] <= lease["start"])
+                        )
+
+    def test_resource_pool_size(self):
+
+        with self.assertRaises(ValueError):
+            with scope_pool(resource_list, pool_size=0):
+                pass
+
+    def test_resource_local(self):
+
+        path = Path(os.path.join(dir, "data_resource/resource_local.py"))
+
+        with self.subTest("the resource is set up in the worker"):
+            test_plan = collect_tests([path], GroupBy.FUNCTION)
+            _ = TestReport()
+            run_test_plan(test_plan)
+            for tests in test_plan:
+                for test in tests:
+                    self.assertEqual(
+                        test.status, TestStatus.PASSED, test.output.getvalue()
+                    )
+                    output = json.loads(test.output.getvalue())
+                    self.assertEqual(output["pid"], output["worker"])
+
+        with self.subTest("the tests of the scope are not in the same group"):
+            test_plan = collect_tests([path], GroupBy.NONE)
+            _ = TestReport()
+            run_test_plan(test_plan)
+            for tests in test_plan:
+                self.assertEqual(tests[0].status, TestStatus.BROKEN)
+
+        with self.subTest("the resource is shared by a resource manager"):
+            test_plan = collect_tests([path], GroupBy.FUNCTION)
+            _ = TestReport()
+            run_test_plan(test_plan, local_resources=LocalResources.NONE)
+            for tests in test_plan:
+                for test in tests:
+                    self.assertEqual(test.status, TestStatus.BROKEN)
+
+    def test_resource_shared_memory(self):
+
+        path = Path(os.path.join(dir, "data_resource/resource_buffer.py"))
+
+        for min_size, shared in ((None, False), (1024, True), (10**7, False)):
+            environ = {LYMBO_SHARED_MEMORY_MIN_SIZE: str(min_size)} if min_size else {}
+            with self.subTest(min_size=min_size), patch.dict(os.environ, environ):
+                test_plan = collect_tests([path], GroupBy.NONE)
+                _ = TestReport()
+                run_test_plan(test_plan)
+                for tests in test_plan:
+                    output = json.loads(tests[0].output.getvalue())
+                    self.assertEqual(output["equal"], 1)
+                    self.assertEqual(
+                        output["type"], "memoryview" if shared else "bytes"
+                    )
+                    self.assertEqual(output["readonly"], 1)
+
+    def test_share_buffer_full(self):
+
+        with patch(
+            "multiprocessing.shared_memory.SharedMemory",
+            side_effect=OSError(28, "No space left on device"),
+        ):
+            self.assertIsNone(share_buffer(b"x" * 4096, 1024))
+
+    def test_resource_shared_memory_cleanup(self):
+
+        path = Path(os.path.join(dir, "data_resource/resource_buffer.py"))
+
+        for start_method in ("fork", "forkserver", "spawn"):
+            with tempfile.TemporaryDirectory() as cwd:
+                completed = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "lymbo",
+                        str(path),
+                        "--shared-memory-min-size=1024",
+                        "--no-cache",
+                        "--no-history",
+                        f"--start-method={start_method}",
+                        "--workers=2",
+                    ],
+                    cwd=cwd,
+                    env={**os.environ, "PYTHONPATH": os.path.dirname(dir)},
+                    capture_output=True,
+                    text=True,
+                    timeout=300,
+                )
+
+            with self.subTest("the tests are executed", start_method=start_method):
+                self.assertEqual(completed.returncode, 0, completed.stdout)
+
+            with self.subTest(
+                "the shared memory blocks are released once", start_method=start_method
+            ):
+                self.assertEqual(completed.stderr, "")
+
     def test_resource_hierarchy(self):
 
         test_plan = collect_tests(
@@ -104,6 +285,102 @@ class TestResource(unittest.TestCase):
                 self.assertEqual(test.status, TestStatus.BROKEN)
                 self.assertIn("You can't share a resource with the scope", test.reason)
 
+    def test_resource_setup_failure(self):
+
+        test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_resource/resource_failure.py"))],
+            GroupBy.NONE,
+            "scope_failure_wrong_args",
+        )
+
+        _ = TestReport()
+
+        with patch.dict(os.environ, {LYMBO_RESOURCE_TIMEOUT: "30"}):
+            tstart = time.time()
+            run_test_plan(test_plan)
+
+        with self.subTest("the tests don't wait for the resource timeout"):
+            self.assertLess(time.time() - tstart, 30)
+
+        with self.subTest("the tests raise the exception of the setup"):
+            for group in test_plan:
+                for test in group:
+                    self.assertEqual(test.status, TestStatus.BROKEN)
+                    self.assertIn("TypeError", "".join(test.error_message))
+
+    def test_prewarm_messages(self):
+
+        path_a = Path(os.path.join(dir, "data_resource/resource_a.py"))
+        path_b = Path(os.path.join(dir, "data_resource/resource_b.py"))
+
+        test_plan = collect_tests([path_a, path_b], GroupBy.NONE)
+
+        with self.subTest("the global and the module scopes are pre-warmed"):
+            scope_ids = {message["scope_id"] for message in prewarm_messages(test_plan)}
+            self.assertSetEqual(
+                scope_ids, {LYMBO_TEST_SCOPE_GLOBAL, str(path_a), str(path_b)}
+            )
+
+        with self.subTest("only the global scope"):
+            scope_ids = {
+                message["scope_id"]
+                for message in prewarm_messages(test_plan, scopes=("global",))
+            }
+            self.assertSetEqual(scope_ids, {LYMBO_TEST_SCOPE_GLOBAL})
+
+    def test_resource_prewarm_failure(self):
+
+        test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_resource/resource_failure.py"))],
+            GroupBy.NONE,
+            "scope_failure_prewarm",
+        )
+
+        _ = TestReport()
+
+        with patch.dict(os.environ, {LYMBO_RESOURCE_TIMEOUT: "30"}):
+            tstart = time.time()
+            run_test_plan(test_plan, prewarm=True)
+
+        with self.subTest("the tests don't wait for the resource timeout"):
+            self.assertLess(time.time() - tstart, 30)
+
+        with self.subTest("the tests raise the exception of the pre-warmed setup"):
+            for group in test_plan:
+                for test in group:
+                    self.assertEqual(test.status, TestStatus.BROKEN)
+                    self.assertIn("the setup has failed", test.reason)
+
+    def test_resource_prewarm_unpicklable_failure(self):
+
+        coordinator = ScopeCoordinator()
+        coordinator.add_tests({LYMBO_TEST_SCOPE_GLOBAL: 1})
+
+        with patch(
+            "lymbo.resource_manager.setup_resource",
+            side_effect=RuntimeError(lambda: None),  # can't be pickled
+        ):
+            prewarm_resource(
+                coordinator,
+                {},
+                LYMBO_TEST_SCOPE_GLOBAL,
+                path=os.path.join(dir, "data_resource/resource_failure.py"),
+                cm="resource_failing",
+                args=(),
+                kwargs={},
+                environ={},
+            )
+
+        # the only resource acquired in this scope
+        (resource_id,) = coordinator.resources[LYMBO_TEST_SCOPE_GLOBAL]
+        resource = coordinator.get_resource(LYMBO_TEST_SCOPE_GLOBAL, resource_id)
+
+        with self.subTest("the tests receive an exception"):
+            self.assertIsNotNone(resource)
+            self.assertIsInstance(
+                pickle.loads(resource[0]), LymboExceptionResourceNotShareable
+            )
+
     def test_resource_nested(self):
 
         test_plan = collect_tests(
@@ -128,5 +405,73 @@ class TestResource(unittest.TestCase):
         self.assert_same_resource(resources, "nested", 3)
 
 
+@contextlib.contextmanager
+def resource_list():
+    yield [1, 2, 3]
+
+
+class TestResourcesCache(unittest.TestCase):
+
+    def test_cache(self):
+
+        coordinator = ScopeCoordinator()
+        coordinator.add_tests({"global": 3, "module_a": 2, "module_b": 1})
+        resource_id = f"{resource_list.__module__}.{resource_list.__name__}.{()}.{{}}"
+        for scope_id in ("global", "module_a"):
+            coordinator.acquire(scope_id, resource_id)
+            coordinator.set_resource(scope_id, resource_id, pickle.dumps([1, 2, 3]), "")
+
+        with (
+            patch.object(lymbo, "_coordinator", coordinator),
+            patch.object(lymbo, "_resources_cache", {}),
+            patch.object(lymbo, "_resources_cache_hits", 0),
+            patch.object(lymbo, "_resources_cache_misses", 0),
+            patch.dict(
+                os.environ,
+                {
+                    LYMBO_TEST_SCOPE_GLOBAL: "global",
+                    LYMBO_TEST_SCOPE_MODULE: "module_a",
+                    LYMBO_TEST_SCOPE_MAX: "global",
+                },
+            ),
+        ):
+            resources = []
+            for _ in range(2):
+                with scope_global(resource_list) as resource:
+                    resources.append(resource)
+
+            with self.subTest("the resource is unpickled once by the worker"):
+                self.assertIs(resources[0], resources[1])
+                self.assertEqual(lymbo._resources_cache_misses, 1)
+                self.assertEqual(lymbo._resources_cache_hits, 1)
+
+            with scope_module(resource_list):
+                pass
+
+            unset_scope(coordinator, Mock(scopes={LYMBO_TEST_SCOPE_GLOBAL: "global"}))
+
+            with self.subTest("the scope is not closed yet"):
+                self.assertIn("global", lymbo._resources_cache)
+                self.assertIn("module_a", lymbo._resources_cache)
+
+            # the last test of the module is executed by another worker
+            coordinator.finish_test(["module_a"])
+            coordinator.finish_test(["module_a"])
+
+            unset_scope(coordinator, Mock(scopes={LYMBO_TEST_SCOPE_MODULE: "module_b"}))
+
+            with self.subTest(
+                "the resource is forgotten when another worker closes the scope"
+            ):
+                self.assertNotIn("module_a", lymbo._resources_cache)
+                self.assertIn("global", lymbo._resources_cache)
+
+            unset_scope(coordinator, Mock(scopes={LYMBO_TEST_SCOPE_GLOBAL: "global"}))
+            unset_scope(coordinator, Mock(scopes={LYMBO_TEST_SCOPE_GLOBAL: "global"}))
+
+            with self.subTest("the resource is forgotten when the scope is closed"):
+                self.assertNotIn("global", lymbo._resources_cache)
+
+
 if __name__ == "__main__":
     unittest.main()
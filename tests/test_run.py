@@ -1,13 +1,18 @@
 import json
 import os
 from pathlib import Path
+import queue
 import unittest
 
 from lymbo.collect import collect_tests
 from lymbo.item import GroupBy
 from lymbo.item import TestStatus
 from lymbo.run import run_test_plan
+from lymbo.report import ReportMode
+from lymbo.report import ResultsWriter
+from lymbo.report import RESULTS_FILENAME
 from lymbo.report import TestReport
+from lymbo.report import TestResults
 
 dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -56,6 +61,19 @@ class TestRunTestPlan(unittest.TestCase):
 
         self.assertEqual(len(set(workers_pids)), 2)
 
+    def test_run_summary(self):
+
+        test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_run/run_status.py"))], GroupBy.NONE
+        )
+
+        _ = TestReport()
+
+        summary = run_test_plan(test_plan, 1)
+
+        self.assertGreater(summary.prepare_scopes, 0)
+        self.assertGreater(summary.workers_startup, 0)
+
 
 class TestTestItemStatus(unittest.TestCase):
 
@@ -126,5 +144,77 @@ class TestTestItemSExpectedAssetion(unittest.TestCase):
         self._test("match_")
 
 
+class TestReportMode(unittest.TestCase):
+
+    def _run(self, mode):
+        test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_run/run_status.py"))], GroupBy.NONE
+        )
+
+        report = TestReport(mode=mode)
+
+        run_test_plan(test_plan, 1)
+
+        return test_plan, report
+
+    def test_report_mode_stream(self):
+
+        test_plan, report = self._run(ReportMode.STREAM)
+
+        with open(os.path.join(report.path, RESULTS_FILENAME)) as f:
+            results = [json.loads(line) for line in f]
+
+        uuids = [test.uuid for group in test_plan for test in group]
+
+        # a result when the test starts, then when it ends
+        self.assertEqual(len(results), 2 * len(uuids))
+        self.assertSetEqual({result["uuid"] for result in results}, set(uuids))
+
+        # the tests are updated without reading the report
+        for group in test_plan:
+            for test in group:
+                self.assertEqual(test.status.value, test.fnc)
+
+    def test_results_writer_broken_result(self):
+
+        report = TestReport(mode=ReportMode.STREAM)
+
+        results_queue = queue.Queue()
+        writer = ResultsWriter(results_queue)
+        writer.start()
+
+        results_queue.put({"uuid": "not serializable", "value": object()})
+        results_queue.put({"no uuid": True})
+        results_queue.put({"uuid": "valid"})
+        results_queue.put(None)
+        writer.join(10)
+
+        with self.subTest("the writer has received all the results"):
+            self.assertFalse(writer.is_alive())
+            self.assertListEqual(list(writer.results), ["valid"])
+
+        with self.subTest("only the valid result is saved"):
+            with open(os.path.join(report.path, RESULTS_FILENAME)) as f:
+                self.assertListEqual(
+                    [json.loads(line) for line in f], [{"uuid": "valid"}]
+                )
+
+    def test_report_mode_files(self):
+
+        test_plan, report = self._run(ReportMode.FILES)
+
+        self.assertFalse(os.path.exists(os.path.join(report.path, RESULTS_FILENAME)))
+
+        # the report files are loaded once at the end of the run
+        for group in test_plan:
+            for test in group:
+                self.assertEqual(test.status.value, test.fnc)
+
+        results = TestResults.load(report.path)
+        self.assertSetEqual(
+            set(results), {test.uuid for group in test_plan for test in group}
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
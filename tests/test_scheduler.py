@@ -0,0 +1,181 @@
+import concurrent.futures
+import os
+from pathlib import Path
+import threading
+import time
+import unittest
+
+from lymbo.collect import collect_tests
+from lymbo.env import LYMBO_TEST_SCOPE_CLASS
+from lymbo.item import GroupBy
+from lymbo.scheduler import schedule
+from lymbo.scheduler import ScheduleMode
+from lymbo.scheduler import shared_resources
+from lymbo.scheduler import shared_scopes
+from lymbo.scheduler import submit_groups
+from lymbo.scheduler import tail_latency
+
+dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def is_contiguous(items):
+    """True if an item never reappears after another one."""
+    seen = set()
+    previous = None
+    for item in items:
+        if item != previous:
+            if item in seen:
+                return False
+            seen.add(item)
+            previous = item
+    return True
+
+
+class TestSchedule(unittest.TestCase):
+
+    def setUp(self):
+        self.test_plan = collect_tests(
+            [
+                Path(os.path.join(dir, "data_run/run_status.py")),
+                Path(os.path.join(dir, "data_resource/resource_a.py")),
+            ],
+            GroupBy.MODULE,
+        )
+
+    def modules(self, groups):
+        return [tests[0].path.name for tests in groups]
+
+    def test_schedule_without_history(self):
+
+        # the largest group first
+        self.assertListEqual(
+            self.modules(schedule(self.test_plan)), ["resource_a.py", "run_status.py"]
+        )
+
+    def test_schedule_with_history(self):
+
+        durations = {
+            test.uuid: 60.0 if test.path.name == "run_status.py" else 0.1
+            for tests in self.test_plan
+            for test in tests
+        }
+
+        # the longest group first
+        self.assertListEqual(
+            self.modules(schedule(self.test_plan, durations)),
+            ["run_status.py", "resource_a.py"],
+        )
+
+    def test_schedule_same_cost(self):
+
+        test_plan = collect_tests(
+            [Path(os.path.join(dir, "data_run/run_status.py"))], GroupBy.NONE
+        )
+
+        # the order of the test plan is kept
+        self.assertListEqual(
+            [str(tests[0]) for tests in schedule(test_plan)],
+            [str(tests[0]) for tests in test_plan],
+        )
+
+    def test_schedule_scope(self):
+
+        test_plan = collect_tests(
+            [
+                Path(os.path.join(dir, "data_resource/resource_a.py")),
+                Path(os.path.join(dir, "data_resource/resource_b.py")),
+            ],
+            GroupBy.NONE,
+        )
+
+        # the longest tests are in both modules
+        durations = {
+            test.uuid: float(position % 7)
+            for position, tests in enumerate(test_plan)
+            for test in tests
+        }
+
+        with self.subTest("the modules are mixed without scope"):
+            modules = self.modules(schedule(test_plan, durations))
+            self.assertFalse(is_contiguous(modules))
+
+        groups = schedule(test_plan, durations, ScheduleMode.SCOPE)
+
+        with self.subTest("the groups of a module are executed one after the other"):
+            self.assertTrue(is_contiguous(self.modules(groups)))
+
+        with self.subTest("the groups of a class are executed one after the other"):
+            self.assertTrue(
+                is_contiguous(
+                    [tests[0].scopes[LYMBO_TEST_SCOPE_CLASS] for tests in groups]
+                )
+            )
+
+        with self.subTest("all the groups are scheduled"):
+            self.assertEqual(len(groups), len(list(test_plan)))
+
+    def test_submit_groups_max_live_resources(self):
+
+        groups = schedule(
+            collect_tests(
+                [
+                    Path(os.path.join(dir, "data_run/run_status.py")),
+                    Path(os.path.join(dir, "data_resource/resource_a.py")),
+                    Path(os.path.join(dir, "data_resource/resource_b.py")),
+                ],
+                GroupBy.NONE,
+            ),
+            mode=ScheduleMode.SCOPE,
+        )
+
+        lock = threading.Lock()
+        periods = {}  # the start and the end of each group
+
+        def run(tests):
+            with lock:
+                start = time.perf_counter()
+            time.sleep(0.002)
+            with lock:
+                periods[id(tests)] = (start, time.perf_counter())
+            return tests
+
+        for max_live_resources in (3, 4):
+            with self.subTest(max_live_resources=max_live_resources):
+                with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+                    futures = submit_groups(executor, run, groups, max_live_resources)
+
+                self.assertListEqual([future.result() for future in futures], groups)
+
+                # a resource is alive from the start of the first group which uses it
+                # to the end of the last group of its scope
+                alive = {}
+                for tests in groups:
+                    start, _ = periods[id(tests)]
+                    for resource in shared_resources(tests):
+                        alive[resource] = min(alive.get(resource, start), start)
+                resources = {
+                    (scope_id, resource): (
+                        start,
+                        max(
+                            periods[id(tests)][1]
+                            for tests in groups
+                            if scope_id in shared_scopes(tests)
+                        ),
+                    )
+                    for (scope_id, resource), start in alive.items()
+                }
+
+                max_alive = max(
+                    sum(start <= at < end for start, end in resources.values())
+                    for at, _ in periods.values()
+                )
+                self.assertLessEqual(max_alive, max_live_resources)
+
+    def test_tail_latency(self):
+
+        self.assertEqual(tail_latency({}), 0.0)
+        self.assertEqual(tail_latency({1: 10.0, 2: 12.5, 3: 11.0}), 2.5)
+
+
+if __name__ == "__main__":
+    unittest.main()